@@ -1,3 +1,16 @@
+import sys
+import timeit
+from bisect import bisect_right
+
+try:
+    import numpy as np
+except ImportError:  # NumPy необязателен, без него работает хеш-версия
+    np = None
+
+# Начиная с этого размера two_sum_auto переключается на NumPy
+NUMPY_THRESHOLD = 50_000
+
+
 class Solution:
     def two_sum(self, nums, target):
         for num in nums:
@@ -12,6 +25,321 @@ class Solution:
                     return [i, j]
         return []
 
+    def build_index(self, nums):
+        """
+        Строит индекс значение -> отсортированный список позиций.
+        Проверка типов выполняется в том же проходе.
+        """
+        index = {}
+        for pos, num in enumerate(nums):
+            if not isinstance(num, int):
+                raise TypeError(
+                    f"Все элементы массива должны быть целыми числами. Найден элемент типа {type(num).__name__}: {num}")
+            positions = index.get(num)
+            if positions is None:
+                index[num] = [pos]
+            else:
+                positions.append(pos)
+        return index
+
+    def two_sum_hash(self, nums, target, index=None):
+        """
+        Хеш-версия two_sum за O(n).
+        Возвращает ту же пару, что и вложенный цикл: минимальный i,
+        а для него минимальный j > i.
+        index - заранее построенный build_index(nums), если он уже есть
+        """
+        if index is None:
+            index = self.build_index(nums)
+
+        for i, num in enumerate(nums):
+            positions = index.get(target - num)
+            # Позиции отсортированы, поэтому достаточно проверить последнюю
+            if positions and positions[-1] > i:
+                return [i, positions[bisect_right(positions, i)]]
+        return []
+
+    def two_sum_batch(self, nums, targets):
+        """
+        Отвечает на много целевых сумм по одному массиву.
+        Индекс строится один раз и переиспользуется для всех targets.
+        """
+        index = self.build_index(nums)
+        return [self.two_sum_hash(nums, target, index) for target in targets]
+
+    def two_sum_numpy(self, nums, target, chunk_size=65536):
+        """
+        Векторизованная версия на NumPy: argsort + searchsorted.
+        Семантика та же, что у two_sum (минимальный i, затем минимальный j).
+        Если массив не помещается в int64, используется two_sum_hash.
+        """
+        if np is None:
+            raise ImportError("Для two_sum_numpy нужен NumPy")
+
+        try:
+            values = np.asarray(nums)
+        except OverflowError:
+            return self.two_sum_hash(nums, target)
+        # Не целые числа (или bool, или object для больших int) - хеш-версия
+        # сама проверит типы и выбросит TypeError
+        if values.ndim != 1 or values.dtype.kind not in "iu":
+            return self.two_sum_hash(nums, target)
+        if len(values) < 2:
+            return []
+        values = values.astype(np.int64, copy=False)
+
+        # Вычитание target - x не должно переполнять int64
+        limit = 2 ** 62
+        if not (-limit < target < limit) or values.min() <= -limit or values.max() >= limit:
+            return self.two_sum_hash(nums, target)
+
+        # Устойчивая сортировка: позиции одинаковых значений идут по возрастанию
+        order = np.argsort(values, kind="stable")
+        sorted_values = values[order]
+
+        # Идем блоками, чтобы остановиться на первой найденной паре
+        for begin in range(0, len(values), chunk_size):
+            positions = np.arange(begin, min(begin + chunk_size, len(values)))
+            complements = target - values[positions]
+            lo = np.searchsorted(sorted_values, complements, side="left")
+            hi = np.searchsorted(sorted_values, complements, side="right")
+
+            # Последняя позиция в блоке дополнения должна быть правее i
+            last = order[np.maximum(hi - 1, 0)]
+            valid = (hi > lo) & (last > positions)
+            if not valid.any():
+                continue
+
+            k = int(np.argmax(valid))
+            i = int(positions[k])
+            block = order[lo[k]:hi[k]]
+            j = int(block[np.searchsorted(block, i, side="right")])
+            return [i, j]
+        return []
+
+    def two_sum_stream(self, stream, target, max_entries=None):
+        """
+        Потоковый two_sum: элементы читаются из итератора по одному.
+        Возвращает (пара, статистика) сразу после первой найденной пары.
+
+        Так как вход целиком не известен, возвращается пара с минимальным j
+        (для него - минимальный i). Индекс дополнений хранит первую позицию
+        каждого значения; max_entries ограничивает его размер - при
+        переполнении вытесняется самое старое значение, поэтому пары с
+        слишком далекими элементами могут быть пропущены.
+        """
+        if max_entries is not None and max_entries < 1:
+            raise ValueError("max_entries должно быть не меньше 1")
+        seen = {}
+        peak_entries = 0
+        peak_bytes = sys.getsizeof(seen)
+        count = 0
+
+        for j, num in enumerate(stream):
+            if not isinstance(num, int):
+                raise TypeError(
+                    f"Все элементы массива должны быть целыми числами. Найден элемент типа {type(num).__name__}: {num}")
+            count += 1
+
+            i = seen.get(target - num)
+            if i is not None:
+                return [i, j], self._stream_stats(count, peak_entries, peak_bytes)
+
+            if num not in seen:
+                if max_entries is not None and len(seen) >= max_entries:
+                    # Словарь хранит порядок вставки - первый ключ самый старый
+                    del seen[next(iter(seen))]
+                seen[num] = j
+                if len(seen) > peak_entries:
+                    peak_entries = len(seen)
+                    peak_bytes = max(peak_bytes, sys.getsizeof(seen))
+
+        return [], self._stream_stats(count, peak_entries, peak_bytes)
+
+    @staticmethod
+    def _stream_stats(count, peak_entries, peak_bytes):
+        return {
+            'read': count,
+            'peak_entries': peak_entries,
+            # Размер таблицы словаря без учета самих int-объектов
+            'peak_bytes': peak_bytes,
+        }
+
+    def iter_all_pairs(self, nums, target):
+        """
+        Лениво перечисляет все пары индексов (i, j), i < j,
+        с nums[i] + nums[j] == target. Пары идут по возрастанию j, затем i.
+        Время O(n + число пар), без вложенного цикла.
+        """
+        seen = {}
+        for j, num in enumerate(nums):
+            if not isinstance(num, int):
+                raise TypeError(
+                    f"Все элементы массива должны быть целыми числами. Найден элемент типа {type(num).__name__}: {num}")
+            for i in seen.get(target - num, ()):
+                yield (i, j)
+            seen.setdefault(num, []).append(j)
+
+    def iter_three_sum(self, nums, target):
+        """Лениво перечисляет все тройки индексов с суммой target"""
+        return self.iter_k_sum(nums, target, 3)
+
+    def iter_k_sum(self, nums, target, k):
+        """
+        Лениво перечисляет все наборы из k индексов i1 < ... < ik,
+        сумма элементов которых равна target.
+
+        Массив сортируется один раз, первые k - 2 элемента перебираются,
+        а последние два находятся встречным проходом двух указателей.
+        Каждый набор выдается один раз, порядок выдачи не определен.
+        """
+        if k < 1:
+            raise ValueError("k должно быть не меньше 1")
+        self.build_index(nums)  # только проверка типов
+
+        order = sorted(range(len(nums)), key=nums.__getitem__)
+        values = [nums[pos] for pos in order]
+
+        for combo in self._k_sum_sorted(values, target, k, 0):
+            yield tuple(sorted(order[pos] for pos in combo))
+
+    def _k_sum_sorted(self, values, target, k, start):
+        """Комбинации позиций отсортированного массива values[start:]"""
+        n = len(values)
+        if n - start < k:
+            return
+
+        # Отсечения по минимально и максимально возможной сумме
+        if sum(values[start:start + k]) > target or sum(values[n - k:]) < target:
+            return
+
+        if k == 1:
+            for pos in range(start, n):
+                if values[pos] == target:
+                    yield (pos,)
+            return
+
+        if k == 2:
+            yield from self._two_pointer_pairs(values, target, start)
+            return
+
+        for first in range(start, n - k + 1):
+            for rest in self._k_sum_sorted(values, target - values[first], k - 1, first + 1):
+                yield (first,) + rest
+
+    @staticmethod
+    def _two_pointer_pairs(values, target, start):
+        """Все пары позиций values[start:] с суммой target, два указателя"""
+        lo, hi = start, len(values) - 1
+        while lo < hi:
+            total = values[lo] + values[hi]
+            if total < target:
+                lo += 1
+            elif total > target:
+                hi -= 1
+            elif values[lo] == values[hi]:
+                # Весь отрезок lo..hi состоит из одинаковых значений
+                for a in range(lo, hi):
+                    for b in range(a + 1, hi + 1):
+                        yield (a, b)
+                return
+            else:
+                # Блоки одинаковых значений с обеих сторон
+                lo_end = lo
+                while values[lo_end + 1] == values[lo]:
+                    lo_end += 1
+                hi_start = hi
+                while values[hi_start - 1] == values[hi]:
+                    hi_start -= 1
+                for a in range(lo, lo_end + 1):
+                    for b in range(hi_start, hi + 1):
+                        yield (a, b)
+                lo, hi = lo_end + 1, hi_start - 1
+
+    def two_sum_auto(self, nums, target):
+        """Выбирает реализацию по размеру входа: NumPy для больших массивов"""
+        if np is not None and len(nums) >= NUMPY_THRESHOLD:
+            return self.two_sum_numpy(nums, target)
+        return self.two_sum_hash(nums, target)
+
+
+def iter_chunks(chunks):
+    """Разворачивает поток блоков (списков чисел) в поток чисел"""
+    for chunk in chunks:
+        yield from chunk
+
+
+def iter_file_numbers(file, chunk_size=65536):
+    """
+    Читает целые числа, разделенные пробелами или переводами строк,
+    из текстового файла блоками по chunk_size символов.
+    file - путь или открытый текстовый файл
+    """
+    if isinstance(file, str):
+        with open(file, encoding='utf-8') as handle:
+            yield from iter_file_numbers(handle, chunk_size)
+        return
+
+    tail = ""
+    while True:
+        chunk = file.read(chunk_size)
+        if not chunk:
+            break
+        parts = (tail + chunk).split()
+        # Последнее число может быть разрезано границей блока
+        if chunk[-1].isspace():
+            tail = ""
+        else:
+            tail = parts.pop() if parts else ""
+        for part in parts:
+            yield int(part)
+    if tail:
+        yield int(tail)
+
+
+def benchmark(sizes=(100, 1000, 3000), number=3):
+    """
+    Сравнивает вложенный цикл two_sum с хеш-версией и пакетным режимом.
+    Худший случай: пары нет, оба алгоритма просматривают весь массив.
+    """
+    solution = Solution()
+    results = []
+    for size in sizes:
+        nums = list(range(size))
+        target = -1
+        targets = [-1] * 10
+
+        naive = min(timeit.repeat(lambda: solution.two_sum(nums, target), number=number, repeat=3))
+        hashed = min(timeit.repeat(lambda: solution.two_sum_hash(nums, target), number=number, repeat=3))
+        batch = min(timeit.repeat(lambda: solution.two_sum_batch(nums, targets), number=number, repeat=3))
+
+        results.append((size, naive, hashed, batch))
+        print(f"n={size}: вложенный цикл {naive:.6f} с, хеш {hashed:.6f} с, "
+              f"пакет из {len(targets)} запросов {batch:.6f} с")
+    return results
+
+
+def benchmark_large(sizes=(100_000, 1_000_000), number=3):
+    """Сравнивает хеш-версию и NumPy-версию на больших массивах"""
+    solution = Solution()
+    results = []
+    for size in sizes:
+        nums = list(range(size))
+        target = -1
+
+        hashed = min(timeit.repeat(lambda: solution.two_sum_hash(nums, target), number=number, repeat=3))
+        if np is not None:
+            vectorized = min(timeit.repeat(lambda: solution.two_sum_numpy(nums, target), number=number, repeat=3))
+        else:
+            vectorized = None
+
+        results.append((size, hashed, vectorized))
+        if vectorized is None:
+            print(f"n={size}: хеш {hashed:.6f} с, NumPy не установлен")
+        else:
+            print(f"n={size}: хеш {hashed:.6f} с, NumPy {vectorized:.6f} с")
+    return results
+
 
 my_solution = Solution()
 
@@ -19,3 +347,7 @@ my_solution = Solution()
 print(my_solution.two_sum([2, 7, 11, 15], 9))
 print(my_solution.two_sum([3, 2, 4], 6))
 print(my_solution.two_sum([3, 2, 4], 6))
+
+if __name__ == "__main__":
+    benchmark()
+    benchmark_large()
@@ -0,0 +1,293 @@
+"""
+Общий модуль замеров времени для лабораторных.
+
+Лабораторные регистрируют свои наборы замеров (suites) через
+register_suite, а BenchmarkRunner выполняет их с прогревом,
+подбором числа повторений и статистикой (min / медиана / IQR).
+Результаты вместе с описанием окружения дописываются в JSON Lines,
+чтобы запуски можно было сравнивать между собой.
+
+Запуск: python benchmark.py lab4.factorial lab6.trees [--compare]
+"""
+
+import argparse
+import hashlib
+import importlib.util
+import inspect
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+
+LABS_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Файл с историей запусков по умолчанию
+DEFAULT_STORE = os.path.join(LABS_DIR, 'benchmark_results.jsonl')
+
+# Кэш результатов замеров по умолчанию
+DEFAULT_CACHE = os.path.join(LABS_DIR, '.benchmark_cache.json')
+
+# Модули лабораторных, в которых объявлены наборы замеров
+LAB_MODULES = {
+    'lab4': os.path.join(LABS_DIR, 'lab4', 'factorial.py'),
+    'lab6': os.path.join(LABS_DIR, 'lab6', 'comparison.py'),
+}
+
+# Имя набора -> функция, которая выдает (имя случая, параметры, функция без аргументов)
+SUITES = {}
+
+
+def register_suite(name):
+    """Декоратор: регистрирует набор замеров под именем name"""
+    def decorator(suite):
+        SUITES[name] = suite
+        return suite
+    return decorator
+
+
+def capture_environment():
+    """Описание окружения, в котором сделаны замеры"""
+    try:
+        commit = subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=LABS_DIR, capture_output=True,
+                                text=True, timeout=5).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        commit = None
+
+    return {
+        'timestamp': datetime.now(timezone.utc).isoformat(),
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'platform': platform.platform(),
+        'machine': platform.machine(),
+        'processor': platform.processor(),
+        'cpu_count': os.cpu_count(),
+        'commit': commit,
+    }
+
+
+class BenchmarkRunner:
+    """
+    Замер функции без аргументов.
+    warmup - число прогревочных вызовов,
+    repeat - число замеров, по которым считается статистика,
+    min_time - минимальная длительность одного замера в секундах;
+    число вызовов в замере подбирается так, чтобы ее достичь.
+    """
+
+    def __init__(self, warmup=1, repeat=7, min_time=0.05, timer=time.perf_counter):
+        if repeat < 1:
+            raise ValueError("repeat должно быть не меньше 1")
+        self.warmup = warmup
+        self.repeat = repeat
+        self.min_time = min_time
+        self.timer = timer
+
+    def _run(self, func, number):
+        begin = self.timer()
+        for _ in range(number):
+            func()
+        return self.timer() - begin
+
+    def calibrate(self, func):
+        """Подбирает число вызовов (1, 2, 5, 10, 20, ...) на один замер"""
+        number = 1
+        while True:
+            for factor in (1, 2, 5):
+                candidate = number * factor
+                if self._run(func, candidate) >= self.min_time:
+                    return candidate
+            number *= 10
+
+    def measure(self, func):
+        """Возвращает статистику времени одного вызова func в секундах"""
+        for _ in range(self.warmup):
+            func()
+
+        number = self.calibrate(func)
+        times = [self._run(func, number) / number for _ in range(self.repeat)]
+
+        if len(times) > 1:
+            q1, median, q3 = statistics.quantiles(times, n=4)
+        else:
+            q1 = median = q3 = times[0]
+
+        return {
+            'min': min(times),
+            'median': median,
+            'q1': q1,
+            'q3': q3,
+            'iqr': q3 - q1,
+            'mean': statistics.fmean(times),
+            'number': number,
+            'repeat': self.repeat,
+        }
+
+    def run_suite(self, name):
+        """Выполняет зарегистрированный набор, возвращает запись о запуске"""
+        if name not in SUITES:
+            raise KeyError(f"Набор замеров '{name}' не зарегистрирован")
+
+        results = []
+        for case, params, func in SUITES[name]():
+            stats = self.measure(func)
+            results.append({'case': case, 'params': params, **stats})
+            print(f"{name}: {case} - медиана {stats['median'] * 1000:.4f} мс, "
+                  f"IQR {stats['iqr'] * 1000:.4f} мс")
+
+        return {
+            'suite': name,
+            'environment': capture_environment(),
+            'runner': {'warmup': self.warmup, 'repeat': self.repeat, 'min_time': self.min_time},
+            'results': results,
+        }
+
+
+class ResultStore:
+    """История запусков в файле JSON Lines: одна строка - один запуск набора"""
+
+    def __init__(self, path=DEFAULT_STORE):
+        self.path = path
+
+    def append(self, run):
+        with open(self.path, 'a', encoding='utf-8') as file:
+            file.write(json.dumps(run, ensure_ascii=False))
+            file.write('\n')
+
+    def load(self, suite=None):
+        """Все сохраненные запуски (только набора suite, если он задан)"""
+        if not os.path.exists(self.path):
+            return []
+        runs = []
+        with open(self.path, encoding='utf-8') as file:
+            for line in file:
+                if line.strip():
+                    run = json.loads(line)
+                    if suite is None or run['suite'] == suite:
+                        runs.append(run)
+        return runs
+
+    def previous(self, suite):
+        """Последний сохраненный запуск набора или None"""
+        runs = self.load(suite)
+        return runs[-1] if runs else None
+
+
+class ResultCache:
+    """
+    Кэш замеров в JSON-файле. Ключ - хеш исходного кода замеряемых
+    функций (и их зависимостей), параметров и версии Python: пока код не
+    менялся, повторный запуск берет результат из файла.
+    """
+
+    def __init__(self, path=DEFAULT_CACHE):
+        self.path = path
+        self._data = None
+
+    def _load(self):
+        if self._data is None:
+            self._data = {}
+            if os.path.exists(self.path):
+                with open(self.path, encoding='utf-8') as file:
+                    try:
+                        self._data = json.load(file)
+                    except json.JSONDecodeError:
+                        self._data = {}
+        return self._data
+
+    @staticmethod
+    def _source(obj):
+        # functools.partial: важен код самой функции
+        obj = getattr(obj, 'func', obj)
+        try:
+            return inspect.getsource(obj)
+        except (OSError, TypeError):
+            return getattr(obj, '__qualname__', repr(obj))
+
+    def key(self, code, params):
+        """Ключ кэша: code - функция (класс) или список функций и классов"""
+        if not isinstance(code, (list, tuple)):
+            code = [code]
+        digest = hashlib.sha256()
+        for obj in code:
+            digest.update(self._source(obj).encode('utf-8'))
+        digest.update(json.dumps(params, sort_keys=True, default=repr).encode('utf-8'))
+        digest.update(platform.python_version().encode('utf-8'))
+        return digest.hexdigest()
+
+    def get_or_measure(self, code, params, measure):
+        """Возвращает сохраненный результат или вызывает measure() и сохраняет его"""
+        data = self._load()
+        key = self.key(code, params)
+        if key not in data:
+            data[key] = measure()
+            self.save()
+        return data[key]
+
+    def save(self):
+        with open(self.path, 'w', encoding='utf-8') as file:
+            json.dump(self._load(), file, ensure_ascii=False)
+
+    def clear(self):
+        self._data = {}
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+
+def compare_runs(old, new):
+    """
+    Сравнивает медианы двух запусков одного набора.
+    Возвращает список (случай, старая медиана, новая медиана, отношение новой к старой).
+    """
+    old_medians = {result['case']: result['median'] for result in old['results']}
+    rows = []
+    for result in new['results']:
+        before = old_medians.get(result['case'])
+        if before is None:
+            continue
+        ratio = result['median'] / before if before else float('inf')
+        rows.append((result['case'], before, result['median'], ratio))
+    return rows
+
+
+def load_lab_suites(labs=None):
+    """Импортирует модули лабораторных, чтобы они зарегистрировали свои наборы"""
+    for lab in labs or LAB_MODULES:
+        path = LAB_MODULES[lab]
+        spec = importlib.util.spec_from_file_location(f"bench_{lab}", path)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Замеры времени лабораторных")
+    parser.add_argument('suites', nargs='*', help="наборы замеров (по умолчанию все)")
+    parser.add_argument('--store', default=DEFAULT_STORE, help="файл истории запусков")
+    parser.add_argument('--compare', action='store_true', help="сравнить с предыдущим запуском")
+    parser.add_argument('--repeat', type=int, default=7)
+    parser.add_argument('--warmup', type=int, default=1)
+    parser.add_argument('--min-time', type=float, default=0.05)
+    args = parser.parse_args(argv)
+
+    load_lab_suites()
+    runner = BenchmarkRunner(warmup=args.warmup, repeat=args.repeat, min_time=args.min_time)
+    store = ResultStore(args.store)
+
+    for name in args.suites or sorted(SUITES):
+        previous = store.previous(name)
+        run = runner.run_suite(name)
+        store.append(run)
+
+        if args.compare and previous is not None:
+            print(f"Сравнение {name} с запуском {previous['environment']['timestamp']}:")
+            for case, before, after, ratio in compare_runs(previous, run):
+                print(f"  {case}: {before * 1000:.4f} мс -> {after * 1000:.4f} мс (x{ratio:.2f})")
+
+
+if __name__ == "__main__":
+    # Лабораторные импортируют модуль как benchmark - пусть это будет этот же модуль
+    sys.modules.setdefault('benchmark', sys.modules[__name__])
+    sys.exit(main())
@@ -1,3 +1,206 @@
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+try:
+    import numpy as np
+except ImportError:  # без NumPy пакетный поиск работает на списках
+    np = None
+
+
+# Флаг остановки, общий для процессов пула (задается в _init_worker)
+_stop_event = None
+
+
+def _init_worker(stop_event):
+    global _stop_event
+    _stop_event = stop_event
+
+
+def _scan_range(number, start, end, check_every):
+    """
+    Перебирает [start, end] в процессе пула.
+    Раз в check_every попыток проверяет, не нашел ли число другой процесс.
+    Возвращает (найденное число или None, попытки).
+    """
+    tries = 0
+    current_guess = start
+
+    while current_guess <= end:
+        block_end = min(current_guess + check_every - 1, end)
+        while current_guess <= block_end:
+            tries += 1
+            if current_guess == number:
+                _stop_event.set()
+                return current_guess, tries
+            current_guess += 1
+
+        if _stop_event.is_set():
+            break
+
+    return None, tries
+
+
+class SearchEngine:
+    """
+    Поиск по монотонному предикату: находит наименьшее x, для которого
+    predicate(x) истинно (предикат ложен слева и истинен справа).
+
+    Если задана функция key и значение target, предикатом считается
+    key(x) >= target - тогда доступен интерполяционный поиск.
+    Каждый вызов предиката считается пробой; повторные пробы одной
+    точки берутся из кэша, так как проба может быть дорогой.
+    """
+
+    STRATEGIES = ('binary', 'exponential', 'interpolation', 'ternary')
+
+    def __init__(self, predicate=None, key=None, target=None):
+        if predicate is None and key is None:
+            raise ValueError("Нужно задать predicate или key")
+        if key is not None and target is None:
+            raise ValueError("Для key нужно задать target")
+        self.predicate = predicate
+        self.key = key
+        self.target = target
+        self.probes = 0
+        self._cache = {}
+
+    def _key(self, x):
+        if x not in self._cache:
+            self.probes += 1
+            self._cache[x] = self.key(x)
+        return self._cache[x]
+
+    def probe(self, x):
+        """Значение предиката в точке x"""
+        if self.key is not None:
+            return self._key(x) >= self.target
+        if x not in self._cache:
+            self.probes += 1
+            self._cache[x] = bool(self.predicate(x))
+        return self._cache[x]
+
+    def choose_strategy(self, high):
+        """Автовыбор: без верхней границы - экспоненциальный, с key - интерполяционный"""
+        if high is None:
+            return 'exponential'
+        if self.key is not None:
+            return 'interpolation'
+        return 'binary'
+
+    def search(self, low, high=None, strategy='auto'):
+        """
+        Ищет первое x >= low с истинным предикатом (x <= high, если high задан).
+        Возвращает (x или None, число проб за этот поиск).
+        """
+        if strategy == 'auto':
+            strategy = self.choose_strategy(high)
+        if strategy not in self.STRATEGIES:
+            raise ValueError(f"Неизвестная стратегия: {strategy}")
+        if high is None and strategy != 'exponential':
+            raise ValueError(f"Стратегии {strategy} нужна верхняя граница")
+        if strategy == 'interpolation' and self.key is None:
+            raise ValueError("Интерполяционному поиску нужна функция key")
+
+        probes_before = self.probes
+        result = getattr(self, strategy)(low, high)
+        return result, self.probes - probes_before
+
+    def binary(self, low, high):
+        """Бинарный поиск первой истинной точки в [low, high]"""
+        answer = None
+        while low <= high:
+            mid = (low + high) // 2
+            if self.probe(mid):
+                answer = mid
+                high = mid - 1
+            else:
+                low = mid + 1
+        return answer
+
+    def exponential(self, low, high=None):
+        """
+        Экспоненциальный (галопирующий) поиск: шаги 1, 2, 4, ... от low,
+        затем бинарный поиск внутри найденного отрезка.
+        Работает и без верхней границы.
+        """
+        if high is not None and low > high:
+            return None
+        if self.probe(low):
+            return low
+
+        last_false = low
+        step = 1
+        while True:
+            bound = low + step
+            if high is not None and bound >= high:
+                return self.binary(last_false + 1, high)
+            if self.probe(bound):
+                return self.binary(last_false + 1, bound)
+            last_false = bound
+            step *= 2
+
+    def interpolation(self, low, high):
+        """
+        Интерполяционный поиск по монотонной функции key.
+        Если интерполяция два шага подряд сужает отрезок хуже, чем вдвое,
+        следующий шаг делается бинарным - так худший случай остается
+        логарифмическим.
+        """
+        if low > high:
+            return None
+        low_key = self._key(low)
+        if low_key >= self.target:
+            return low
+        high_key = self._key(high)
+        if high_key < self.target:
+            return None
+
+        # Инвариант: key(low) < target <= key(high)
+        slow_steps = 0
+        while high - low > 1:
+            width = high - low
+            if slow_steps >= 2 or high_key == low_key:
+                mid = (low + high) // 2
+            else:
+                # key может возвращать float - позиция пробы всегда целая
+                mid = low + int((self.target - low_key) * width // (high_key - low_key))
+                mid = min(max(mid, low + 1), high - 1)
+
+            mid_key = self._key(mid)
+            if mid_key >= self.target:
+                high, high_key = mid, mid_key
+            else:
+                low, low_key = mid, mid_key
+            if (high - low) * 2 > width:
+                slow_steps += 1
+            else:
+                slow_steps = 0
+        return high
+
+    def ternary(self, low, high):
+        """
+        Тернарный поиск: отрезок делится на три части двумя пробами.
+        Итераций меньше, чем у бинарного, но проб в среднем больше,
+        поэтому автоматически не выбирается.
+        """
+        answer = None
+        while low <= high:
+            third = (high - low) // 3
+            first = low + third
+            second = high - third
+            if self.probe(first):
+                answer = first
+                high = first - 1
+            elif self.probe(second):
+                answer = second
+                low, high = first + 1, second - 1
+            else:
+                low = second + 1
+        return answer
+
+
 class Game:
     def slow_guess(self, number, start, end):
         tries = 0
@@ -17,6 +220,60 @@ class Game:
         return None, tries
 
 
+    def parallel_slow_guess(self, number, start, end, workers=None, check_every=10000):
+        """
+        Перебор, разделенный между процессами: [start, end] режется на
+        workers равных отрезков. Как только один процесс нашел число,
+        остальные останавливаются. Попытки суммируются по всем процессам.
+        """
+        if start > end:
+            print("Не смог найти число в указанном диапазоне")
+            return None, 0
+
+        workers = workers or os.cpu_count() or 1
+        size = end - start + 1
+        step = -(-size // workers)  # деление с округлением вверх
+        parts = [(low, min(low + step - 1, end)) for low in range(start, end + 1, step)]
+
+        stop_event = multiprocessing.Event()
+        result = None
+        tries = 0
+
+        with ProcessPoolExecutor(max_workers=len(parts), initializer=_init_worker,
+                                 initargs=(stop_event,)) as executor:
+            futures = [executor.submit(_scan_range, number, low, high, check_every)
+                       for low, high in parts]
+            for future in as_completed(futures):
+                found, part_tries = future.result()
+                tries += part_tries
+                if found is not None:
+                    result = found
+
+        if result is not None:
+            print(f"Это число {result}")
+        else:
+            print("Не смог найти число в указанном диапазоне")
+        return result, tries
+
+    def compare_slow_guess(self, number, start, end, workers=None):
+        """
+        Сравнивает время обычного и параллельного перебора.
+        Возвращает словарь с результатами, попытками и ускорением.
+        """
+        begin = time.perf_counter()
+        serial_result, serial_tries = self.slow_guess(number, start, end)
+        serial_time = time.perf_counter() - begin
+
+        begin = time.perf_counter()
+        parallel_result, parallel_tries = self.parallel_slow_guess(number, start, end, workers)
+        parallel_time = time.perf_counter() - begin
+
+        return {
+            'serial': (serial_result, serial_tries, serial_time),
+            'parallel': (parallel_result, parallel_tries, parallel_time),
+            'speedup': serial_time / parallel_time if parallel_time else float('inf'),
+        }
+
     def binary_guess(self, number, start, end):
         tries = 0
         low = start
@@ -39,6 +296,105 @@ class Game:
         return None, tries
 
 
+    def batch_binary_guess(self, numbers, start, end, quiet=True):
+        """
+        Бинарный поиск сразу для многих загаданных чисел в одном диапазоне.
+        Все поиски идут синхронно: на каждом шаге массивы low/high
+        обновляются одной векторной операцией.
+
+        Возвращает (guesses, tries). С NumPy guesses - маскированный массив
+        (маска там, где число не найдено), tries - массив int64; без NumPy -
+        списки с None на месте ненайденных чисел.
+        Попытки совпадают с binary_guess для каждого числа.
+        quiet=True - никакого вывода; иначе печатается итог после поиска.
+        """
+        limit = 2 ** 62
+        if np is not None and -limit < start and end < limit:
+            guesses, tries = self._batch_binary_guess_numpy(numbers, start, end)
+            found = int(guesses.count())
+        else:
+            guesses, tries = self._batch_binary_guess_python(numbers, start, end)
+            found = sum(guess is not None for guess in guesses)
+
+        if not quiet:
+            print(f"Найдено {found} из {len(tries)} чисел")
+        return guesses, tries
+
+    def _batch_binary_guess_numpy(self, numbers, start, end):
+        try:
+            numbers = np.asarray(numbers, dtype=np.int64)
+        except OverflowError:
+            # Числа вне int64 все равно не найдутся; прижимаем их к границам
+            # [start - 1, end + 1] - число попыток при этом не меняется
+            numbers = np.asarray([min(max(number, start - 1), end + 1) for number in numbers],
+                                 dtype=np.int64)
+        size = len(numbers)
+        low = np.full(size, start, dtype=np.int64)
+        high = np.full(size, end, dtype=np.int64)
+        tries = np.zeros(size, dtype=np.int64)
+        guesses = np.zeros(size, dtype=np.int64)
+        found = np.zeros(size, dtype=bool)
+
+        active = low <= high
+        while active.any():
+            idx = np.flatnonzero(active)
+            tries[idx] += 1
+            guess = (low[idx] + high[idx]) // 2
+            target = numbers[idx]
+
+            hit = guess == target
+            guesses[idx[hit]] = guess[hit]
+            found[idx[hit]] = True
+
+            less = guess < target
+            low[idx[less]] = guess[less] + 1
+            greater = guess > target
+            high[idx[greater]] = guess[greater] - 1
+
+            active[idx[hit]] = False
+            active[idx] &= low[idx] <= high[idx]
+
+        return np.ma.masked_array(guesses, mask=~found), tries
+
+    def _batch_binary_guess_python(self, numbers, start, end):
+        guesses = []
+        tries_list = []
+        for number in numbers:
+            tries = 0
+            low, high = start, end
+            guess = None
+            while low <= high:
+                tries += 1
+                mid = (low + high) // 2
+                if mid == number:
+                    guess = mid
+                    break
+                elif mid < number:
+                    low = mid + 1
+                else:
+                    high = mid - 1
+            guesses.append(guess)
+            tries_list.append(tries)
+        return guesses, tries_list
+
+    def predicate_guess(self, number, start, end, strategy='auto'):
+        """
+        Угадывание через SearchEngine: ищется первое x с x >= number.
+        Возвращает (число или None, количество проб).
+        """
+        if strategy in ('auto', 'interpolation'):
+            engine = SearchEngine(key=lambda x: x, target=number)
+        else:
+            engine = SearchEngine(lambda x: x >= number)
+        guess, tries = engine.search(start, end, strategy)
+
+        if guess == number:
+            print(f"Нашел! Это число {guess}")
+            return guess, tries
+
+        print("Не смог найти число в указанном диапазоне")
+        return None, tries
+
     def get_number_from_user(self, prompt, min_val=None, max_val=None):
         while True:
             try:
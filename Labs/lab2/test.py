@@ -1,5 +1,6 @@
 import unittest
-from game import Game
+import game as game_module
+from game import Game, SearchEngine
 
 class TestGame(unittest.TestCase):
     
@@ -96,5 +97,143 @@ class TestGame(unittest.TestCase):
         self.assertEqual(result, 999999)
         self.assertLessEqual(tries, 20)
 
+    def test_parallel_slow_guess_found(self):
+        game = Game()
+        result, tries = game.parallel_slow_guess(750, 1, 1000, workers=4, check_every=10)
+        self.assertEqual(result, 750)
+        # Процесс с последним отрезком нашел число за 1 попытку,
+        # остальные могли успеть перебрать свои отрезки целиком
+        self.assertGreaterEqual(tries, 1)
+        self.assertLessEqual(tries, 1000)
+
+    def test_parallel_slow_guess_not_found(self):
+        game = Game()
+        result, tries = game.parallel_slow_guess(15, 1, 10, workers=3)
+        self.assertIsNone(result)
+        self.assertEqual(tries, 10)
+
+    def test_parallel_slow_guess_empty_range(self):
+        game = Game()
+        result, tries = game.parallel_slow_guess(5, 10, 1)
+        self.assertIsNone(result)
+        self.assertEqual(tries, 0)
+
+    def test_compare_slow_guess(self):
+        game = Game()
+        report = game.compare_slow_guess(30, 1, 100, workers=2)
+        self.assertEqual(report['serial'][:2], (30, 30))
+        self.assertEqual(report['parallel'][0], 30)
+        self.assertGreater(report['speedup'], 0)
+
+    def test_predicate_guess_strategies(self):
+        game = Game()
+        for strategy in SearchEngine.STRATEGIES:
+            for number in (1, 2, 500, 999, 1000):
+                result, tries = game.predicate_guess(number, 1, 1000, strategy)
+                self.assertEqual(result, number)
+                self.assertGreaterEqual(tries, 1)
+
+    def test_predicate_guess_not_found(self):
+        game = Game()
+        for strategy in SearchEngine.STRATEGIES:
+            result, tries = game.predicate_guess(15, 1, 10, strategy)
+            self.assertIsNone(result)
+
+    def test_predicate_guess_interpolation_efficiency(self):
+        game = Game()
+        result, tries = game.predicate_guess(999999, 1, 1000000)
+        self.assertEqual(result, 999999)
+        self.assertLessEqual(tries, 4)
+
+    def test_batch_binary_guess_matches_single(self):
+        game = Game()
+        numbers = [1, 5, 10, 15, -3, 7]
+        guesses, tries = game.batch_binary_guess(numbers, 1, 10)
+        if game_module.np is not None:
+            # Замаскированные элементы превращаются в None
+            guesses, tries = guesses.tolist(), tries.tolist()
+        expected = [game.binary_guess(number, 1, 10) for number in numbers]
+        self.assertEqual(list(zip(guesses, tries)), expected)
+
+    def test_batch_binary_guess_python_fallback(self):
+        game = Game()
+        numbers = [1, 500, 1000, 2000]
+        guesses, tries = game.batch_binary_guess(numbers, 1, 2 ** 70)
+        for number, guess, count in zip(numbers, guesses, tries):
+            self.assertEqual((guess, count), game.binary_guess(number, 1, 2 ** 70))
+
+    def test_batch_binary_guess_secret_outside_int64(self):
+        game = Game()
+        numbers = [2 ** 70, 5, -2 ** 70]
+        guesses, tries = game.batch_binary_guess(numbers, 1, 10)
+        if game_module.np is not None:
+            guesses, tries = guesses.tolist(), tries.tolist()
+        expected = [game.binary_guess(number, 1, 10) for number in numbers]
+        self.assertEqual(list(zip(guesses, tries)), expected)
+
+    def test_batch_binary_guess_empty_range(self):
+        game = Game()
+        guesses, tries = game.batch_binary_guess([5, 6], 10, 1)
+        self.assertEqual(list(tries), [0, 0])
+
+
+class TestSearchEngine(unittest.TestCase):
+
+    def test_binary_first_true(self):
+        engine = SearchEngine(lambda x: x * x >= 50)
+        result, probes = engine.search(0, 100)
+        self.assertEqual(result, 8)
+        self.assertLessEqual(probes, 7)
+
+    def test_exponential_unbounded(self):
+        engine = SearchEngine(lambda x: x >= 10 ** 12)
+        result, probes = engine.search(0)
+        self.assertEqual(result, 10 ** 12)
+        self.assertLessEqual(probes, 2 * 41)
+
+    def test_exponential_with_high(self):
+        engine = SearchEngine(lambda x: x >= 7)
+        self.assertEqual(engine.search(0, 10, 'exponential')[0], 7)
+        self.assertEqual(engine.search(0, 5, 'exponential')[0], None)
+
+    def test_interpolation_uneven_key(self):
+        engine = SearchEngine(key=lambda x: x ** 3, target=1000)
+        result, _ = engine.search(0, 10 ** 6, 'interpolation')
+        self.assertEqual(result, 10)
+
+    def test_interpolation_float_key(self):
+        values = [i * 0.37 + (i % 7) * 0.01 for i in range(1000)]
+        for target in (100.2, 0.0, 369.5, -1.0):
+            engine = SearchEngine(key=values.__getitem__, target=target)
+            result, _ = engine.search(0, 999)
+            expected = next((i for i, value in enumerate(values) if value >= target), None)
+            self.assertEqual(result, expected)
+            self.assertIs(type(result), int)
+
+    def test_strategies_agree(self):
+        for threshold in range(-5, 30):
+            results = set()
+            for strategy in SearchEngine.STRATEGIES:
+                engine = SearchEngine(key=lambda x: 2 * x, target=threshold)
+                results.add(engine.search(0, 20, strategy)[0])
+            self.assertEqual(len(results), 1)
+
+    def test_probes_are_cached(self):
+        calls = []
+        engine = SearchEngine(lambda x: calls.append(x) or x >= 3)
+        engine.search(0, 10)
+        engine.search(0, 10)
+        self.assertEqual(len(calls), len(set(calls)))
+
+    def test_invalid_arguments(self):
+        with self.assertRaises(ValueError):
+            SearchEngine()
+        with self.assertRaises(ValueError):
+            SearchEngine(lambda x: True).search(0, 10, 'unknown')
+        with self.assertRaises(ValueError):
+            SearchEngine(lambda x: True).search(0, None, 'binary')
+        with self.assertRaises(ValueError):
+            SearchEngine(lambda x: True).search(0, 10, 'interpolation')
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -1,3 +1,22 @@
+import json
+import os
+import sys
+from array import array
+from collections import deque
+
+# Общий модуль уровней в замкнутой форме лежит в каталоге Labs
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import tree_levels
+
+try:
+    import numpy as np
+except ImportError:  # без NumPy используется array('q')
+    np = None
+
+# Начиная с этой высоты дерево выводится потоком, а не одним словарем
+STREAM_HEIGHT = 16
+
+
 class BinTree:
     
     def gen_bin_tree(self, height=6, root=9):
@@ -24,6 +43,184 @@ class BinTree:
         
         return tree
 
+    def gen_bin_tree_array(self, height=6, root=9, use_numpy=None):
+        """
+        Компактное представление дерева в виде неявной кучи:
+        узел i хранится в ячейке i, его потомки - в 2i+1 (левый) и 2i+2 (правый).
+        Уровни строятся целиком векторной арифметикой.
+
+        use_numpy - None (если установлен), True или False.
+        Возвращает numpy.ndarray(int64) или array('q') длины 2^height - 1.
+        """
+        if use_numpy is None:
+            use_numpy = np is not None
+        if use_numpy and np is None:
+            raise ImportError("Для use_numpy=True нужен NumPy")
+
+        if height <= 0:
+            return np.empty(0, dtype=np.int64) if use_numpy else array('q')
+
+        # Значения на последнем уровне по модулю не больше 2^(h-1) * (|root| + 1)
+        if (abs(root) + 1) << (height - 1) >= 2 ** 63:
+            raise OverflowError(f"Значения дерева высоты {height} не помещаются в int64")
+
+        if use_numpy:
+            heap = np.empty(2 ** height - 1, dtype=np.int64)
+            heap[0] = root
+            for level in range(1, height):
+                parents = heap[2 ** (level - 1) - 1:2 ** level - 1]
+                children = heap[2 ** level - 1:2 ** (level + 1) - 1]
+                children[0::2] = parents * 2 + 1
+                children[1::2] = parents * 2 - 1
+            return heap
+
+        heap = array('q', [root])
+        level_start = 0
+        for level in range(1, height):
+            parents = heap[level_start:]
+            level_start = len(heap)
+            children = array('q', bytes(16 * len(parents)))
+            children[0::2] = array('q', [r * 2 + 1 for r in parents])
+            children[1::2] = array('q', [2 * r - 1 for r in parents])
+            heap.extend(children)
+        return heap
+
+    def gen_levels(self, height=6, root=9):
+        """Генератор уровней дерева в замкнутой форме (см. tree_levels.gen_levels)"""
+        return tree_levels.gen_levels(height, root)
+
+    level_closed_form = staticmethod(tree_levels.level_closed_form)
+
+    def iter_nodes(self, height=6, root=9):
+        """
+        Прямой обход дерева без его построения: стек глубины O(h).
+        Выдает (уровень, индекс на уровне, значение, левый, правый).
+        """
+        if height <= 0:
+            return
+        stack = [(root, 0, 0)]
+        while stack:
+            value, level, index = stack.pop()
+            if level + 1 < height:
+                left_root = value * 2 + 1
+                right_root = 2 * value - 1
+                yield level, index, value, left_root, right_root
+                stack.append((right_root, level + 1, 2 * index + 1))
+                stack.append((left_root, level + 1, 2 * index))
+            else:
+                yield level, index, value, None, None
+
+    def write_ndjson(self, out, height=6, root=9):
+        """Пишет узлы дерева в поток по одной JSON-строке, возвращает их число"""
+        count = 0
+        for level, index, value, left, right in self.iter_nodes(height, root):
+            out.write(json.dumps({'level': level, 'index': index, 'value': value,
+                                  'left': left, 'right': right}))
+            out.write('\n')
+            count += 1
+        return count
+
+    def heap_to_dict(self, heap, index=0):
+        """Преобразует кучу из gen_bin_tree_array в словарь формата gen_bin_tree"""
+        if index >= len(heap):
+            return None
+
+        tree = {
+            'root': int(heap[index]),
+            'left': None,
+            'right': None
+        }
+
+        if 2 * index + 1 < len(heap):
+            tree['left'] = self.heap_to_dict(heap, 2 * index + 1)
+            tree['right'] = self.heap_to_dict(heap, 2 * index + 2)
+
+        return tree
+
+
+class LazyBinTree:
+    """
+    Ленивое дерево: узлы не хранятся, а вычисляются по пути от корня.
+    Значение любого узла считается за O(h), поэтому можно работать
+    с деревьями высоты 60+ (значения - обычные int Python без ограничений).
+
+    Путь - строка из 'L' (левый потомок) и 'R' (правый потомок).
+    Индекс узла на уровне - число, биты которого от старшего к младшему
+    задают путь: 0 - налево, 1 - направо.
+    """
+
+    def __init__(self, height=6, root=9):
+        self.height = height
+        self.root = root
+
+    @staticmethod
+    def left_branch(r):
+        return r * 2 + 1
+
+    @staticmethod
+    def right_branch(r):
+        return 2 * r - 1
+
+    @property
+    def size(self):
+        """Количество узлов в дереве (может быть больше sys.maxsize)"""
+        return 2 ** self.height - 1 if self.height > 0 else 0
+
+    def node(self, path=''):
+        """Значение узла по пути из 'L'/'R'"""
+        if len(path) >= self.height:
+            raise IndexError(f"Путь длины {len(path)} выходит за дерево высоты {self.height}")
+
+        value = self.root
+        for step in path.upper():
+            if step == 'L':
+                value = self.left_branch(value)
+            elif step == 'R':
+                value = self.right_branch(value)
+            else:
+                raise ValueError(f"Недопустимый шаг пути: {step!r}")
+        return value
+
+    def value_at(self, level, index):
+        """Значение узла index на уровне level (корень - уровень 0)"""
+        if not 0 <= level < self.height:
+            raise IndexError(f"Уровень {level} вне дерева высоты {self.height}")
+        if not 0 <= index < 2 ** level:
+            raise IndexError(f"Индекс {index} вне уровня {level}")
+
+        value = self.root
+        for shift in range(level - 1, -1, -1):
+            if (index >> shift) & 1:
+                value = self.right_branch(value)
+            else:
+                value = self.left_branch(value)
+        return value
+
+    def level(self, level, start=0, stop=None):
+        """
+        Генератор значений уровня level на отрезке индексов [start, stop).
+        Остальные узлы уровня не вычисляются.
+        """
+        if not 0 <= level < self.height:
+            raise IndexError(f"Уровень {level} вне дерева высоты {self.height}")
+        width = 2 ** level
+        start, stop, _ = slice(start, stop).indices(width)
+        for index in range(start, stop):
+            yield self.value_at(level, index)
+
+    def iter_subtree(self, path=''):
+        """
+        Обход поддерева с корнем в узле path в ширину.
+        Выдает пары (путь, значение); узлы вне поддерева не вычисляются.
+        """
+        queue = deque([(path, self.node(path))])
+        while queue:
+            current_path, value = queue.popleft()
+            yield current_path, value
+            if len(current_path) + 1 < self.height:
+                queue.append((current_path + 'L', self.left_branch(value)))
+                queue.append((current_path + 'R', self.right_branch(value)))
+
 
 if __name__ == "__main__":
     tree_generator = BinTree()
@@ -45,10 +242,14 @@ if __name__ == "__main__":
     else:
         root = int(root_input)
     
-    # Строим дерево с введенными параметрами
-    trees = tree_generator.gen_bin_tree(height, root)
-    
-    # Выводим результат
     print(f"Бинарное дерево с высотой {height} и корнем {root}:")
 
-    print(trees)
+    if height >= STREAM_HEIGHT:
+        # Большое дерево пишем построчно, не собирая его в памяти
+        tree_generator.write_ndjson(sys.stdout, height, root)
+    else:
+        # Строим дерево с введенными параметрами
+        trees = tree_generator.gen_bin_tree(height, root)
+
+        # Выводим результат
+        print(trees)
@@ -1,4 +1,7 @@
-from bintree import BinTree
+import json
+
+import bintree
+from bintree import BinTree, LazyBinTree
 import unittest
 
 
@@ -141,6 +144,129 @@ class TestBinTreeGenerator(unittest.TestCase):
         self.assertEqual(tree['right']['right']['root'], 13)
 
 
+class TestBinTreeArray(unittest.TestCase):
+    def setUp(self):
+        self.generator = BinTree()
+
+    def test_array_layout(self):
+        """Потомки узла i лежат в ячейках 2i+1 и 2i+2"""
+        heap = self.generator.gen_bin_tree_array(height=3, root=4, use_numpy=False)
+        self.assertEqual(list(heap), [4, 9, 7, 19, 17, 15, 13])
+        self.assertEqual(heap.typecode, 'q')
+
+    def test_array_matches_dict(self):
+        """Преобразование обратно дает то же дерево, что и gen_bin_tree"""
+        for height in range(0, 7):
+            for root in (-3, 0, 9):
+                heap = self.generator.gen_bin_tree_array(height, root, use_numpy=False)
+                self.assertEqual(self.generator.heap_to_dict(heap),
+                                 self.generator.gen_bin_tree(height, root))
+
+    @unittest.skipIf(bintree.np is None, "NumPy не установлен")
+    def test_numpy_matches_array(self):
+        """NumPy-версия совпадает с array('q')"""
+        heap_np = self.generator.gen_bin_tree_array(height=10, root=-5, use_numpy=True)
+        heap_arr = self.generator.gen_bin_tree_array(height=10, root=-5, use_numpy=False)
+        self.assertEqual(heap_np.tolist(), list(heap_arr))
+
+    def test_array_overflow(self):
+        """Слишком высокое дерево не помещается в int64"""
+        with self.assertRaises(OverflowError):
+            self.generator.gen_bin_tree_array(height=64, root=1, use_numpy=False)
+
+
+class TestLazyBinTree(unittest.TestCase):
+    def test_node_by_path(self):
+        """Значения по пути совпадают с gen_bin_tree"""
+        tree = BinTree().gen_bin_tree(height=3, root=4)
+        lazy = LazyBinTree(height=3, root=4)
+        self.assertEqual(lazy.node(''), 4)
+        self.assertEqual(lazy.node('L'), tree['left']['root'])
+        self.assertEqual(lazy.node('RL'), tree['right']['left']['root'])
+        self.assertEqual(lazy.node('rr'), tree['right']['right']['root'])
+
+    def test_value_at_matches_heap(self):
+        """Уровень и индекс соответствуют раскладке кучи"""
+        heap = BinTree().gen_bin_tree_array(height=6, root=9, use_numpy=False)
+        lazy = LazyBinTree(height=6, root=9)
+        for level in range(6):
+            for index in range(2 ** level):
+                self.assertEqual(lazy.value_at(level, index), heap[2 ** level - 1 + index])
+
+    def test_level_slice(self):
+        """Срез уровня"""
+        lazy = LazyBinTree(height=3, root=4)
+        self.assertEqual(list(lazy.level(2)), [19, 17, 15, 13])
+        self.assertEqual(list(lazy.level(2, 1, 3)), [17, 15])
+        self.assertEqual(list(lazy.level(2, -1)), [13])
+
+    def test_subtree(self):
+        """Обход поддерева"""
+        lazy = LazyBinTree(height=3, root=4)
+        self.assertEqual(list(lazy.iter_subtree('R')), [('R', 7), ('RL', 15), ('RR', 13)])
+
+    def test_huge_height(self):
+        """Дерево высоты 100 не строится целиком"""
+        lazy = LazyBinTree(height=100, root=9)
+        self.assertEqual(lazy.size, 2 ** 100 - 1)
+        self.assertEqual(lazy.value_at(99, 0), lazy.node('L' * 99))
+        self.assertEqual(lazy.value_at(99, 0), 10 * 2 ** 99 - 1)
+
+    def test_out_of_range(self):
+        """Обращения за пределы дерева"""
+        lazy = LazyBinTree(height=2, root=1)
+        with self.assertRaises(IndexError):
+            lazy.node('LL')
+        with self.assertRaises(IndexError):
+            lazy.value_at(1, 2)
+        with self.assertRaises(ValueError):
+            lazy.node('X')
+
+
+class TestClosedFormLevels(unittest.TestCase):
+    def test_levels_match_heap(self):
+        """Уровни в замкнутой форме совпадают с построенной кучей"""
+        generator = BinTree()
+        for root in (-7, 0, 9):
+            heap = generator.gen_bin_tree_array(height=8, root=root, use_numpy=False)
+            levels = list(generator.gen_levels(height=8, root=root))
+            self.assertEqual(len(levels), 8)
+            for depth, level in enumerate(levels):
+                self.assertEqual(list(level), list(heap[2 ** depth - 1:2 ** (depth + 1) - 1]))
+
+    def test_big_int_fallback(self):
+        """При переполнении int64 уровень возвращается как range"""
+        level = BinTree.level_closed_form(70, 9)
+        self.assertIsInstance(level, range)
+        self.assertEqual(level[0], LazyBinTree(height=71, root=9).value_at(70, 0))
+        self.assertEqual(level[-1], LazyBinTree(height=71, root=9).value_at(70, 2 ** 70 - 1))
+
+    def test_zero_height(self):
+        """При нулевой высоте уровней нет"""
+        self.assertEqual(list(BinTree().gen_levels(height=0)), [])
+
+
+class TestBinTreeStreaming(unittest.TestCase):
+    def test_iter_nodes_match_tree(self):
+        """Узлы обхода совпадают с кучей"""
+        generator = BinTree()
+        heap = generator.gen_bin_tree_array(height=5, root=9, use_numpy=False)
+        nodes = list(generator.iter_nodes(height=5, root=9))
+        self.assertEqual(len(nodes), 31)
+        for level, index, value, left, right in nodes:
+            self.assertEqual(value, heap[2 ** level - 1 + index])
+
+    def test_write_ndjson(self):
+        """Одна JSON-строка на узел"""
+        import io
+        out = io.StringIO()
+        count = BinTree().write_ndjson(out, height=2, root=5)
+        lines = [json.loads(line) for line in out.getvalue().splitlines()]
+        self.assertEqual(count, 3)
+        self.assertEqual(lines[0], {'level': 0, 'index': 0, 'value': 5, 'left': 11, 'right': 9})
+        self.assertEqual([line['value'] for line in lines], [5, 11, 9])
+
+
 if __name__ == "__main__":
     # Запускаем все тесты
     unittest.main()
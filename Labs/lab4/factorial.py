@@ -1,6 +1,18 @@
-import timeit
+import os
+import sys
+import threading
+from concurrent.futures import ProcessPoolExecutor
+import matplotlib
+matplotlib.use('Agg')  # график сохраняется в файл, окно не нужно
 import matplotlib.pyplot as plt
 import random
+from bisect import bisect_right, insort
+from collections import OrderedDict
+from functools import partial
+
+# Общий модуль замеров лежит в каталоге Labs
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from benchmark import BenchmarkRunner, ResultCache, register_suite
 
 
 def fact_recursive(n: int) -> int:
@@ -10,6 +22,44 @@ def fact_recursive(n: int) -> int:
     return n * fact_recursive(n - 1)
 
 
+def _fact_frame(n):
+    """
+    Кадр рекурсивного факториала в виде генератора: вместо вызова
+    fact(n - 1) он отдает аргумент через yield и получает результат обратно.
+    """
+    if n == 0:
+        return 1
+    sub_result = yield n - 1
+    return n * sub_result
+
+
+def trampoline(frame_func, arg):
+    """
+    Выполняет рекурсию, описанную генераторами-кадрами, на явном стеке.
+    Глубина рекурсии не ограничена sys.getrecursionlimit().
+    """
+    stack = [frame_func(arg)]
+    result = None
+    while stack:
+        try:
+            # Передаем кадру результат завершившегося вложенного вызова
+            sub_arg = stack[-1].send(result)
+        except StopIteration as stop:
+            stack.pop()
+            result = stop.value
+        else:
+            stack.append(frame_func(sub_arg))
+            result = None
+    return result
+
+
+def fact_trampoline(n: int) -> int:
+    """Рекурсивный факториал той же структуры, что fact_recursive, для любого n"""
+    if n < 0:
+        raise ValueError("Факториал определен только для n >= 0")
+    return trampoline(_fact_frame, n)
+
+
 def fact_iterative(n: int) -> int:
     """Нерекурсивный факториал"""
     res = 1
@@ -18,14 +68,300 @@ def fact_iterative(n: int) -> int:
     return res
 
 
+def _range_product(low, high):
+    """Произведение чисел low..high деревом: сомножители одного размера"""
+    if high - low < 8:
+        res = 1
+        for i in range(low, high + 1):
+            res *= i
+        return res
+    mid = (low + high) // 2
+    return _range_product(low, mid) * _range_product(mid + 1, high)
+
+
+def _product(factors, low=0, high=None):
+    """Произведение списка деревом (сбалансированные сомножители)"""
+    if high is None:
+        high = len(factors)
+    if high - low <= 4:
+        res = 1
+        for i in range(low, high):
+            res *= factors[i]
+        return res
+    mid = (low + high) // 2
+    return _product(factors, low, mid) * _product(factors, mid, high)
+
+
+def fact_binary_split(n: int) -> int:
+    """Факториал двоичным разбиением: 1..n перемножается деревом"""
+    if n < 0:
+        raise ValueError("Факториал определен только для n >= 0")
+    if n < 2:
+        return 1
+    return _range_product(1, n)
+
+
+def _primes_up_to(n):
+    """Решето Эратосфена: список простых чисел не больше n"""
+    sieve = bytearray([1]) * (n + 1)
+    sieve[0:2] = b'\x00\x00'
+    for p in range(2, int(n ** 0.5) + 1):
+        if sieve[p]:
+            sieve[p * p::p] = bytes(len(range(p * p, n + 1, p)))
+    return [p for p in range(2, n + 1) if sieve[p]]
+
+
+def _swing(n, primes):
+    """
+    Swing-число n!/((n//2)!)^2 через разложение на простые.
+    Показатель простого p - число нечетных среди n//p, n//p^2, ...
+    """
+    factors = []
+    for p in primes:
+        if p > n:
+            break
+        q, exponent = n, 0
+        while q:
+            q //= p
+            exponent += q & 1
+        if exponent:
+            factors.append(p ** exponent)
+    return _product(factors)
+
+
+def fact_prime_swing(n: int) -> int:
+    """Факториал алгоритмом prime swing: n! = ((n//2)!)^2 * swing(n)"""
+    if n < 0:
+        raise ValueError("Факториал определен только для n >= 0")
+    primes = _primes_up_to(n)
+
+    def rec(m):
+        if m < 2:
+            return 1
+        return rec(m // 2) ** 2 * _swing(m, primes)
+
+    return rec(n)
+
+
+def fact_parallel(n: int, workers=None, chunks=None) -> int:
+    """
+    Факториал на пуле процессов: 1..n делится на chunks отрезков,
+    каждый процесс считает произведение своего отрезка деревом,
+    а частичные произведения перемножаются сбалансированным деревом.
+    """
+    if n < 0:
+        raise ValueError("Факториал определен только для n >= 0")
+    workers = workers or os.cpu_count() or 1
+    chunks = chunks or 4 * workers
+    if workers == 1 or n < 1000:
+        return fact_binary_split(n)
+
+    step = -(-n // chunks)  # деление с округлением вверх
+    lows = list(range(1, n + 1, step))
+    highs = [min(low + step - 1, n) for low in lows]
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        partials = list(executor.map(_range_product, lows, highs))
+    return _product(partials)
+
+
+class FactorialCache:
+    """
+    Таблица факториалов, общая для нескольких потоков.
+
+    Новое значение считается от ближайшего меньшего n из таблицы, а не
+    с единицы: остаток base+1..n перемножается сбалансированным деревом.
+    Вместе с n сохраняется ближайшая контрольная точка ниже n (кратная
+    spacing), поэтому соседние запросы досчитываются коротким
+    произведением. Значение, которое одно больше max_bytes, не
+    сохраняется, а остальные вытесняются по принципу LRU, когда общий
+    размер таблицы превышает max_bytes (0! не вытесняется никогда).
+    """
+
+    def __init__(self, spacing=1000, max_bytes=64 * 2 ** 20):
+        if spacing < 1:
+            raise ValueError("spacing должно быть не меньше 1")
+        self.spacing = spacing
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict([(0, 1)])  # n -> n!, в порядке использования
+        self._keys = [0]  # те же n по возрастанию для поиска ближайшего
+        self._bytes = 1
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def _size(value):
+        return (value.bit_length() + 7) // 8
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+
+    def __contains__(self, n):
+        with self._lock:
+            return n in self._entries
+
+    def get(self, n):
+        """Возвращает n!, используя и пополняя таблицу"""
+        if n < 0:
+            raise ValueError("Факториал определен только для n >= 0")
+
+        with self._lock:
+            if n in self._entries:
+                self._entries.move_to_end(n)
+                self.hits += 1
+                return self._entries[n]
+            self.misses += 1
+            base = self._keys[bisect_right(self._keys, n) - 1]
+            value = self._entries[base]
+            self._entries.move_to_end(base)
+
+        # Досчитываем без блокировки, чтобы не задерживать другие потоки
+        computed = []
+        checkpoint = n // self.spacing * self.spacing
+        if base < checkpoint < n:
+            value *= _range_product(base + 1, checkpoint)
+            computed.append((checkpoint, value))
+            base = checkpoint
+        value *= _range_product(base + 1, n)
+        computed.append((n, value))
+
+        with self._lock:
+            for key, result in computed:
+                self._store(key, result)
+
+        return value
+
+    def _store(self, key, value):
+        """Добавляет значение, если оно помещается в max_bytes, и вытесняет лишнее"""
+        if key in self._entries:
+            self._entries.move_to_end(key)
+            return
+        size = self._size(value)
+        # Вместе с 0! значение должно помещаться в max_bytes, иначе оно
+        # вытеснило бы само себя
+        if size + self._size(1) > self.max_bytes:
+            return
+        self._entries[key] = value
+        insort(self._keys, key)
+        self._bytes += size
+        self._evict()
+
+    def _evict(self):
+        """Вытесняет давно не использованные значения сверх max_bytes"""
+        while self._bytes > self.max_bytes and len(self._entries) > 1:
+            key = next(iter(self._entries))
+            if key == 0:
+                self._entries.move_to_end(0)
+                continue
+            value = self._entries.pop(key)
+            del self._keys[bisect_right(self._keys, key) - 1]
+            self._bytes -= self._size(value)
+            self.evictions += 1
+
+    def stats(self):
+        """Состояние таблицы: записи, байты, попадания, промахи, вытеснения"""
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+            }
+
+
+# Общая таблица для fact_cached
+factorial_cache = FactorialCache()
+
+
+def fact_cached(n: int) -> int:
+    """Факториал через общую таблицу factorial_cache"""
+    return factorial_cache.get(n)
+
+
 def benchmark(func, n, repeat=10):
-    """Возвращает среднее время выполнения func(n)"""
-    times = timeit.repeat(lambda: func(n), number=50, repeat=20)
-    return min(times)
+    """Возвращает минимальное время одного вызова func(n) по repeat замерам"""
+    return BenchmarkRunner(repeat=repeat, min_time=0.01).measure(partial(func, n))['min']
+
+
+@register_suite('lab4.factorial')
+def factorial_suite():
+    """Набор замеров для общего модуля benchmark"""
+    for n in (10, 100, 500, 900):
+        for func in (fact_recursive, fact_iterative):
+            yield f"{func.__name__}(n={n})", {'n': n}, partial(func, n)
+
+
+def benchmark_big(ns=(10 ** 3, 10 ** 4, 10 ** 5, 10 ** 6), funcs=None):
+    """
+    Сравнивает быстрые алгоритмы с исходными на больших n (один замер на точку).
+    fact_recursive пропускается, если n не помещается в лимит рекурсии.
+    fact_iterative при n = 10^6 работает несколько минут.
+    Возвращает словарь {имя функции: [время или None для каждого n]}.
+    """
+    funcs = funcs or [fact_recursive, fact_iterative, fact_binary_split, fact_prime_swing]
+    runner = BenchmarkRunner(warmup=0, repeat=1, min_time=0)
+    results = {func.__name__: [] for func in funcs}
+
+    for n in ns:
+        for func in funcs:
+            if func is fact_recursive and n > sys.getrecursionlimit() - 100:
+                results[func.__name__].append(None)
+                print(f"n={n}: {func.__name__} пропущен (лимит рекурсии)")
+                continue
+            elapsed = runner.measure(partial(func, n))['min']
+            results[func.__name__].append(elapsed)
+            print(f"n={n}: {func.__name__} {elapsed:.4f} с")
+
+    return results
+
+
+def benchmark_trampoline(ns=(100, 500, 900, 10 ** 4, 10 ** 5), repeat=5):
+    """
+    Накладные расходы fact_trampoline относительно fact_iterative.
+    Возвращает список (n, время итеративного, время трамплина, отношение).
+    """
+    results = []
+    for n in ns:
+        iterative_time = benchmark(fact_iterative, n, repeat)
+        trampoline_time = benchmark(fact_trampoline, n, repeat)
+        results.append((n, iterative_time, trampoline_time, trampoline_time / iterative_time))
+        print(f"n={n}: итеративный {iterative_time:.6f} с, трамплин {trampoline_time:.6f} с "
+              f"(x{trampoline_time / iterative_time:.2f})")
+    return results
+
+
+def benchmark_parallel(n=10 ** 6, core_counts=None):
+    """
+    Ускорение fact_parallel относительно однопоточного fact_binary_split
+    для разного числа процессов. Возвращает список (процессы, время, ускорение).
+    """
+    if core_counts is None:
+        cpu_count = os.cpu_count() or 1
+        core_counts = sorted({1, 2, 4, 8, cpu_count} & set(range(1, cpu_count + 1)))
+
+    runner = BenchmarkRunner(warmup=0, repeat=1, min_time=0)
+    serial_time = runner.measure(partial(fact_binary_split, n))['min']
+    print(f"n={n}: однопоточный fact_binary_split {serial_time:.3f} с")
+
+    results = []
+    for workers in core_counts:
+        elapsed = runner.measure(partial(fact_parallel, n, workers))['min']
+        results.append((workers, elapsed, serial_time / elapsed))
+        print(f"n={n}: процессов {workers} - {elapsed:.3f} с, ускорение x{serial_time / elapsed:.2f}")
+    return results
 
 
+def main(output='factorial.png', cache=None):
+    """
+    Сравнивает рекурсивный и итеративный факториал и сохраняет график в файл.
+    Замеры кэшируются: неизмененные функции повторно не измеряются.
+    """
+    cache = cache or ResultCache()
 
-def main():
     # фиксированный набор данных
     random.seed(42)
     test_data = list(range(10, 1001, 50))
@@ -33,19 +369,25 @@ def main():
     res_recursive = []
     res_iterative = []
 
+    # Ключ кэша учитывает и код замера: обертку benchmark и BenchmarkRunner
     for n in test_data:
-      res_recursive.append(benchmark(fact_recursive, n))
-      res_iterative.append(benchmark(fact_iterative, n))
+      res_recursive.append(cache.get_or_measure([fact_recursive, benchmark, BenchmarkRunner], {'n': n},
+                                                partial(benchmark, fact_recursive, n)))
+      res_iterative.append(cache.get_or_measure([fact_iterative, benchmark, BenchmarkRunner], {'n': n},
+                                                partial(benchmark, fact_iterative, n)))
 
     # Визуализация
+    fig = plt.figure()
     plt.plot(test_data, res_recursive, label="Рекурсивный")
     plt.plot(test_data, res_iterative, label="Итеративный")
     plt.xlabel("n")
     plt.ylabel("Время (сек)")
     plt.title("Сравнение рекурсивного и итеративного факториала")
     plt.legend()
-    plt.show()
+    fig.savefig(output)
+    plt.close(fig)
+    print(f"График сохранен: {output}")
 
 
 if __name__ == "__main__":
-    main() 
+    main()
@@ -0,0 +1,161 @@
+import math
+import random
+import sys
+import threading
+import unittest
+
+from factorial import (FactorialCache, fact_binary_split, fact_parallel, fact_prime_swing,
+                       fact_trampoline)
+
+
+class TestFactorialCache(unittest.TestCase):
+
+    def assertConsistent(self, cache):
+        """Список ключей и счетчик байт соответствуют таблице"""
+        self.assertEqual(cache._keys, sorted(cache._entries))
+        self.assertEqual(cache._bytes, sum(cache._size(value) for value in cache._entries.values()))
+        self.assertIn(0, cache)
+
+    def test_values_match_math(self):
+        cache = FactorialCache(spacing=50)
+        for n in [0, 1, 2, 49, 50, 51, 333, 120, 1000, 999, 7]:
+            self.assertEqual(cache.get(n), math.factorial(n))
+        self.assertConsistent(cache)
+
+    def test_checkpoints_and_hits(self):
+        cache = FactorialCache(spacing=100)
+        cache.get(350)
+        # Сохраняется только ближайшая контрольная точка ниже 350
+        self.assertEqual(sorted(cache._entries), [0, 300, 350])
+        self.assertEqual(cache.get(300), math.factorial(300))
+        stats = cache.stats()
+        self.assertEqual((stats['hits'], stats['misses']), (1, 1))
+        self.assertConsistent(cache)
+
+    def test_negative(self):
+        with self.assertRaises(ValueError):
+            FactorialCache().get(-1)
+        with self.assertRaises(ValueError):
+            FactorialCache(spacing=0)
+
+    def test_eviction_under_small_limit(self):
+        cache = FactorialCache(spacing=10, max_bytes=2000)
+        for n in range(0, 1000, 37):
+            self.assertEqual(cache.get(n), math.factorial(n))
+            self.assertLessEqual(cache.stats()['bytes'], cache.max_bytes)
+            self.assertConsistent(cache)
+        self.assertGreater(cache.evictions, 0)
+        # Вытесненные значения пересчитываются правильно
+        for n in (5, 100, 500):
+            self.assertEqual(cache.get(n), math.factorial(n))
+        self.assertConsistent(cache)
+
+    def test_memory_stays_within_limit(self):
+        """Промах не накапливает все контрольные точки до n"""
+        cache = FactorialCache(spacing=100, max_bytes=2 ** 17)
+        n = 20050
+        self.assertEqual(cache.get(n), math.factorial(n))
+        self.assertEqual(sorted(cache._entries), [0, 20000, 20050])
+        self.assertLessEqual(cache.stats()['bytes'], cache.max_bytes)
+
+        # Значение больше max_bytes не сохраняется
+        small = FactorialCache(spacing=100, max_bytes=2 ** 10)
+        self.assertEqual(small.get(n), math.factorial(n))
+        self.assertEqual(len(small), 1)
+        self.assertConsistent(small)
+
+    def test_zero_is_never_evicted(self):
+        cache = FactorialCache(spacing=1, max_bytes=0)
+        self.assertEqual(cache.get(300), math.factorial(300))
+        self.assertEqual(len(cache), 1)
+        self.assertConsistent(cache)
+
+    def test_lru_order(self):
+        cache = FactorialCache(spacing=1000)
+        cache.get(100)
+        cache.get(200)
+        cache.get(100)  # 100 снова использовано последним
+        cache.max_bytes = cache._bytes - 1
+        cache.get(100)
+        with cache._lock:
+            cache._evict()
+        self.assertIn(100, cache)
+        self.assertNotIn(200, cache)
+        self.assertConsistent(cache)
+
+    def test_concurrent_access(self):
+        cache = FactorialCache(spacing=25, max_bytes=20000)
+        errors = []
+
+        def worker(seed):
+            rnd = random.Random(seed)
+            for _ in range(200):
+                n = rnd.randrange(600)
+                if cache.get(n) != math.factorial(n):
+                    errors.append(n)
+
+        threads = [threading.Thread(target=worker, args=(seed,)) for seed in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(errors, [])
+        self.assertConsistent(cache)
+        stats = cache.stats()
+        self.assertEqual(stats['hits'] + stats['misses'], 8 * 200)
+
+
+class TestFastFactorial(unittest.TestCase):
+
+    def test_small_n(self):
+        for n in range(101):
+            expected = math.factorial(n)
+            self.assertEqual(fact_binary_split(n), expected)
+            self.assertEqual(fact_prime_swing(n), expected)
+
+    def test_large_n(self):
+        for n in (1000, 4097, 20000):
+            expected = math.factorial(n)
+            self.assertEqual(fact_binary_split(n), expected)
+            self.assertEqual(fact_prime_swing(n), expected)
+
+    def test_negative(self):
+        for func in (fact_binary_split, fact_prime_swing):
+            with self.assertRaises(ValueError):
+                func(-1)
+
+
+class TestTrampoline(unittest.TestCase):
+
+    def test_small_n(self):
+        for n in range(101):
+            self.assertEqual(fact_trampoline(n), math.factorial(n))
+
+    def test_deeper_than_recursion_limit(self):
+        n = sys.getrecursionlimit() * 5
+        self.assertEqual(fact_trampoline(n), math.factorial(n))
+
+    def test_negative(self):
+        with self.assertRaises(ValueError):
+            fact_trampoline(-1)
+
+
+class TestParallel(unittest.TestCase):
+
+    def test_small_n_without_pool(self):
+        for n in range(0, 101, 7):
+            self.assertEqual(fact_parallel(n, workers=2), math.factorial(n))
+
+    def test_pool(self):
+        # n >= 1000 и workers > 1 - считается на пуле процессов
+        for n, chunks in ((1000, None), (5003, 7)):
+            self.assertEqual(fact_parallel(n, workers=2, chunks=chunks), math.factorial(n))
+
+    def test_negative(self):
+        with self.assertRaises(ValueError):
+            fact_parallel(-1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,10 +1,209 @@
+import ast
+import json
+import os
+import pickle
+import struct
+import sys
+import time
 from collections import deque, OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+
+# Общий модуль уровней в замкнутой форме лежит в каталоге Labs
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import tree_levels
+
+try:
+    import numpy as np
+except ImportError:  # без NumPy уровни возвращаются как range, а формулы считаются поэлементно
+    np = None
+
+
+def default_left(r):
+    """Левый потомок по умолчанию"""
+    return r*2+1
+
+
+def default_right(r):
+    """Правый потомок по умолчанию"""
+    return 2*r-1
+
+
+class Formula:
+    """
+    Формула потомка от переменной r, проверенная по AST.
+    Допускаются только r, целые константы, унарные + и -, операции
+    + - * // % и ** с неотрицательной целой константой в показателе.
+    Поэтому формула не может выполнить произвольный код.
+    Произведение показателей вложенных степеней не больше MAX_POWER,
+    иначе ((r**64)**64)**64 считалась бы минутами.
+
+    Экземпляр вызывается как функция от одного значения, а метод
+    vectorized считает формулу сразу для массива NumPy.
+    """
+
+    MAX_POWER = 64
+
+    _BINARY_OPS = (ast.Add, ast.Sub, ast.Mult, ast.FloorDiv, ast.Mod, ast.Pow)
+    _UNARY_OPS = (ast.UAdd, ast.USub)
+
+    # Граница значений int64, на которой векторный расчет прекращается
+    _INT64_LIMIT = 2.0 ** 62
+
+    def __init__(self, text):
+        self.text = text.strip()
+        try:
+            tree = ast.parse(self.text, mode='eval')
+        except SyntaxError as e:
+            raise ValueError(f"Синтаксическая ошибка в формуле {text!r}: {e.msg}")
+        self._validate(tree.body)
+        self._body = tree.body
+        self._code = compile(tree, '<formula>', 'eval')
+
+    def _validate(self, node, power=1):
+        """power - произведение показателей степеней, внутри которых стоит node"""
+        if isinstance(node, ast.BinOp):
+            if not isinstance(node.op, self._BINARY_OPS):
+                raise ValueError(f"Недопустимая операция: {type(node.op).__name__}")
+            if isinstance(node.op, ast.Pow):
+                exponent = node.right
+                if not (isinstance(exponent, ast.Constant) and type(exponent.value) is int
+                        and 0 <= exponent.value <= self.MAX_POWER):
+                    raise ValueError(
+                        f"Показатель степени должен быть целой константой от 0 до {self.MAX_POWER}")
+                # Основание при показателе 0 все равно вычисляется
+                power *= max(exponent.value, 1)
+                if power > self.MAX_POWER:
+                    raise ValueError(
+                        f"Произведение показателей вложенных степеней больше {self.MAX_POWER}")
+            self._validate(node.left, power)
+            self._validate(node.right, power)
+        elif isinstance(node, ast.UnaryOp):
+            if not isinstance(node.op, self._UNARY_OPS):
+                raise ValueError(f"Недопустимая операция: {type(node.op).__name__}")
+            self._validate(node.operand, power)
+        elif isinstance(node, ast.Name):
+            if node.id != 'r':
+                raise ValueError(f"Недопустимое имя: {node.id}")
+        elif isinstance(node, ast.Constant):
+            if type(node.value) is not int:
+                raise ValueError(f"Допускаются только целые константы: {node.value!r}")
+        else:
+            raise ValueError(f"Недопустимый элемент формулы: {type(node).__name__}")
+
+    def __call__(self, r):
+        return eval(self._code, {'__builtins__': {}}, {'r': r})
+
+    def __repr__(self):
+        return f"Formula({self.text!r})"
+
+    def __reduce__(self):
+        # Скомпилированный код не сериализуется, поэтому передаем текст
+        return (Formula, (self.text,))
+
+    def vectorized(self, values):
+        """
+        Считает формулу для массива int64.
+        Возвращает массив int64 или None, если NumPy недоступен, значения
+        могут выйти за int64 или встречается деление на ноль - тогда
+        нужно считать поэлементно на int Python.
+        """
+        if np is None:
+            return None
+        values = np.asarray(values, dtype=np.int64)
+        try:
+            result, _ = self._eval_array(self._body, values, values.astype(np.float64))
+        except (OverflowError, ZeroDivisionError):
+            return None
+        if np.ndim(result) == 0:
+            result = np.full(values.shape, result, dtype=np.int64)
+        return result
+
+    def _eval_array(self, node, values, shadow):
+        """
+        Возвращает (значение int64, его оценка в float64).
+        По оценке в float64 проверяется, что промежуточные значения не
+        переполняют int64.
+        """
+        if isinstance(node, ast.Name):
+            return values, shadow
+        if isinstance(node, ast.Constant):
+            if abs(node.value) >= self._INT64_LIMIT:
+                raise OverflowError
+            return np.int64(node.value), float(node.value)
+        if isinstance(node, ast.UnaryOp):
+            operand, operand_shadow = self._eval_array(node.operand, values, shadow)
+            if isinstance(node.op, ast.USub):
+                return -operand, -operand_shadow
+            return operand, operand_shadow
+
+        left, left_shadow = self._eval_array(node.left, values, shadow)
+        op = node.op
+        if isinstance(op, ast.Pow):
+            exponent = node.right.value
+            result_shadow = left_shadow ** exponent
+            self._check_range(result_shadow)
+            return left ** exponent, result_shadow
+
+        right, right_shadow = self._eval_array(node.right, values, shadow)
+        if isinstance(op, ast.Add):
+            result_shadow = left_shadow + right_shadow
+        elif isinstance(op, ast.Sub):
+            result_shadow = left_shadow - right_shadow
+        elif isinstance(op, ast.Mult):
+            result_shadow = left_shadow * right_shadow
+        else:
+            # // и % не увеличивают модуль, но NumPy не сообщает о делении на ноль
+            if np.any(right == 0):
+                raise ZeroDivisionError
+            result = left // right if isinstance(op, ast.FloorDiv) else left % right
+            return result, np.asarray(result, dtype=np.float64)
+
+        self._check_range(result_shadow)
+        if isinstance(op, ast.Add):
+            return left + right, result_shadow
+        if isinstance(op, ast.Sub):
+            return left - right, result_shadow
+        return left * right, result_shadow
+
+    def _check_range(self, shadow):
+        with np.errstate(over='ignore', invalid='ignore'):
+            if not np.all(np.abs(shadow) < self._INT64_LIMIT):
+                raise OverflowError
+
+
+def compile_formula(text):
+    """Компилирует пользовательскую формулу, ValueError при недопустимой"""
+    return Formula(text)
+
+
+# Векторные версии правил по умолчанию
+_DEFAULT_FORMULAS = {
+    default_left: Formula("r*2+1"),
+    default_right: Formula("2*r-1"),
+}
+
+
+# Начиная с этой высоты main не печатает дерево целиком, а пишет его потоком
+STREAM_HEIGHT = 16
+
+# Двоичный формат: заголовок (сигнатура, высота), затем записи
+# (уровень, индекс на уровне, значение). Потомки узла (d, k) - это
+# (d + 1, 2k) и (d + 1, 2k + 1); на последнем уровне потомков нет.
+BINARY_MAGIC = b'GTRE'
+BINARY_HEADER = struct.Struct('<4sH')
+BINARY_RECORD = struct.Struct('<HQq')
+
+
+def _expand_chunk(left_branch, right_branch, values):
+    """Потомки части уровня (выполняется в процессе пула)"""
+    return [left_branch(value) for value in values], [right_branch(value) for value in values]
+
 
 class gen_tree:
     def __init__(self):
         pass
     
-    def gen_bin_tree(self, height=6, root=9, left_branch=lambda r: r*2+1, right_branch=lambda r: 2*r-1):
+    def gen_bin_tree(self, height=6, root=9, left_branch=default_left, right_branch=default_right):
         """
         Строит бинарное дерево нерекурсивным способом
         height - высота дерева
@@ -47,6 +246,303 @@ class gen_tree:
         
         return tree
 
+    def gen_bin_tree_fast(self, height=6, root=9, left_branch=default_left, right_branch=default_right):
+        """
+        Строит то же дерево, что и gen_bin_tree, но целыми уровнями.
+        Если обе ветви - Formula (или правила по умолчанию) и установлен
+        NumPy, уровень считается векторно; при риске переполнения int64
+        расчет переходит на поэлементный с int Python.
+        """
+        tree = OrderedDict()
+        if height <= 0:
+            return tree
+
+        frontier = [root]
+        for level in range(1, height + 1):
+            if level == height:
+                self._add_level(tree, frontier, None, None)
+                break
+            lefts, rights = self._expand_level(frontier, left_branch, right_branch)
+            self._add_level(tree, frontier, lefts, rights)
+            frontier = self._interleave(lefts, rights)
+
+        return tree
+
+    def _expand_level(self, frontier, left_branch, right_branch):
+        """Потомки всех узлов уровня: векторно, если это возможно"""
+        left_formula = _DEFAULT_FORMULAS.get(left_branch, left_branch)
+        right_formula = _DEFAULT_FORMULAS.get(right_branch, right_branch)
+        if np is not None and isinstance(left_formula, Formula) and isinstance(right_formula, Formula):
+            values = frontier if isinstance(frontier, np.ndarray) else self._to_array(frontier)
+            if values is not None:
+                lefts = left_formula.vectorized(values)
+                rights = right_formula.vectorized(values) if lefts is not None else None
+                if rights is not None:
+                    return lefts, rights
+
+        if np is not None and isinstance(frontier, np.ndarray):
+            frontier = frontier.tolist()
+        return [left_branch(value) for value in frontier], [right_branch(value) for value in frontier]
+
+    @staticmethod
+    def _to_array(values):
+        if not values or max(abs(min(values)), abs(max(values))) >= 2 ** 62:
+            return None
+        return np.array(values, dtype=np.int64)
+
+    @staticmethod
+    def _interleave(lefts, rights):
+        """Следующий уровень: левый и правый потомок каждого узла подряд"""
+        if np is not None and isinstance(lefts, np.ndarray):
+            frontier = np.empty(2 * len(lefts), dtype=np.int64)
+        else:
+            frontier = [None] * (2 * len(lefts))
+        frontier[0::2] = lefts
+        frontier[1::2] = rights
+        return frontier
+
+    @staticmethod
+    def _add_level(tree, frontier, lefts, rights):
+        """Добавляет уровень в дерево в том же порядке, что и обход gen_bin_tree"""
+        if np is not None and isinstance(frontier, np.ndarray):
+            frontier = frontier.tolist()
+        if lefts is None:
+            for value in frontier:
+                node = OrderedDict()
+                node['left'] = None
+                node['right'] = None
+                tree[value] = node
+            return
+
+        if np is not None and isinstance(lefts, np.ndarray):
+            lefts, rights = lefts.tolist(), rights.tolist()
+        for value, left_child, right_child in zip(frontier, lefts, rights):
+            node = OrderedDict()
+            node['left'] = left_child
+            node['right'] = right_child
+            tree[value] = node
+
+    def gen_bin_tree_dag(self, height=6, root=9, left_branch=default_left, right_branch=default_right):
+        """
+        Строит то же дерево, что и gen_bin_tree, но повторяющиеся значения
+        раскрываются один раз: одинаковые узлы уровня объединяются (с
+        подсчетом кратности), а потомки каждого значения запоминаются.
+        Время и память зависят от числа различных значений, а не от 2^h.
+
+        Возвращает (дерево, статистика). В статистике:
+        logical_nodes - узлов в полном дереве (с повторами),
+        expanded_nodes - узлов, реально обработанных по уровням,
+        distinct_values - различных значений в дереве,
+        branch_calls - вызовов функций ветвей,
+        sharing_ratio - logical_nodes / expanded_nodes.
+        """
+        tree = OrderedDict()
+        stats = {
+            'logical_nodes': 0,
+            'expanded_nodes': 0,
+            'distinct_values': 0,
+            'branch_calls': 0,
+            'sharing_ratio': 1.0,
+        }
+        if height <= 0:
+            return tree, stats
+
+        children = {}
+        # Значение -> сколько раз оно встречается на текущем уровне
+        frontier = {root: 1}
+
+        for level in range(1, height + 1):
+            stats['logical_nodes'] += sum(frontier.values())
+            stats['expanded_nodes'] += len(frontier)
+
+            if level == height:
+                for value in frontier:
+                    node = OrderedDict()
+                    node['left'] = None
+                    node['right'] = None
+                    tree[value] = node
+                break
+
+            next_frontier = {}
+            for value, count in frontier.items():
+                pair = children.get(value)
+                if pair is None:
+                    pair = children[value] = (left_branch(value), right_branch(value))
+
+                node = OrderedDict()
+                node['left'] = pair[0]
+                node['right'] = pair[1]
+                tree[value] = node
+
+                for child in pair:
+                    next_frontier[child] = next_frontier.get(child, 0) + count
+            frontier = next_frontier
+
+        stats['distinct_values'] = len(tree)
+        stats['branch_calls'] = 2 * len(children)
+        stats['sharing_ratio'] = stats['logical_nodes'] / stats['expanded_nodes']
+        return tree, stats
+
+    def gen_bin_tree_parallel(self, height=6, root=9, left_branch=default_left, right_branch=default_right,
+                              workers=None, min_chunk=4096):
+        """
+        Обход в ширину по уровням: каждый уровень обрабатывается целиком,
+        а большие уровни (от 2 * min_chunk узлов) делятся между процессами
+        ProcessPoolExecutor. Имеет смысл для дорогих функций ветвей.
+        Результат - тот же OrderedDict, что и у gen_bin_tree.
+
+        Функции ветвей должны сериализоваться pickle (функции модуля,
+        Formula); для lambda дерево строится уровнями в текущем процессе.
+        """
+        tree = OrderedDict()
+        if height <= 0:
+            return tree
+
+        workers = workers or os.cpu_count() or 1
+        try:
+            pickle.dumps((left_branch, right_branch))
+            picklable = True
+        except (pickle.PicklingError, AttributeError, TypeError):
+            picklable = False
+
+        executor = None
+        try:
+            frontier = [root]
+            for level in range(1, height + 1):
+                if level == height:
+                    self._add_level(tree, frontier, None, None)
+                    break
+
+                if picklable and workers > 1 and len(frontier) >= 2 * min_chunk:
+                    if executor is None:
+                        executor = ProcessPoolExecutor(max_workers=workers)
+                    size = max(min_chunk, -(-len(frontier) // workers))
+                    chunks = [frontier[i:i + size] for i in range(0, len(frontier), size)]
+                    lefts, rights = [], []
+                    for part_lefts, part_rights in executor.map(
+                            _expand_chunk, [left_branch] * len(chunks), [right_branch] * len(chunks), chunks):
+                        lefts.extend(part_lefts)
+                        rights.extend(part_rights)
+                else:
+                    lefts, rights = _expand_chunk(left_branch, right_branch, frontier)
+
+                self._add_level(tree, frontier, lefts, rights)
+                frontier = self._interleave(lefts, rights)
+        finally:
+            if executor is not None:
+                executor.shutdown()
+
+        return tree
+
+    def benchmark_parallel(self, heights=range(10, 19, 2), root=9, left_branch=default_left,
+                           right_branch=default_right, workers=None):
+        """
+        Сравнивает последовательный gen_bin_tree и gen_bin_tree_parallel.
+        Возвращает список (высота, время последовательно, время параллельно).
+        """
+        results = []
+        for height in heights:
+            begin = time.perf_counter()
+            self.gen_bin_tree(height, root, left_branch, right_branch)
+            serial_time = time.perf_counter() - begin
+
+            begin = time.perf_counter()
+            self.gen_bin_tree_parallel(height, root, left_branch, right_branch, workers)
+            parallel_time = time.perf_counter() - begin
+
+            results.append((height, serial_time, parallel_time))
+            print(f"Высота {height}: последовательно {serial_time:.4f} с, "
+                  f"параллельно {parallel_time:.4f} с")
+        return results
+
+    def iter_tree_records(self, height=6, root=9, left_branch=default_left, right_branch=default_right,
+                          order='dfs'):
+        """
+        Генератор узлов дерева без построения словаря.
+        Выдает кортежи (уровень, индекс на уровне, значение, левый, правый);
+        у листьев потомки равны None.
+
+        order='dfs' - прямой обход со стеком, память O(h) при любой высоте;
+        order='bfs' - обход в ширину как в gen_bin_tree, память O(ширины уровня).
+        """
+        if height <= 0:
+            return
+        if order not in ('dfs', 'bfs'):
+            raise ValueError(f"Неизвестный порядок обхода: {order}")
+
+        pending = deque([(root, 0, 0)])
+        take = pending.pop if order == 'dfs' else pending.popleft
+        while pending:
+            value, level, index = take()
+            if level + 1 < height:
+                left_child = left_branch(value)
+                right_child = right_branch(value)
+                yield level, index, value, left_child, right_child
+                if order == 'dfs':
+                    # Правый кладем первым, чтобы левый был обработан раньше
+                    pending.append((right_child, level + 1, 2 * index + 1))
+                    pending.append((left_child, level + 1, 2 * index))
+                else:
+                    pending.append((left_child, level + 1, 2 * index))
+                    pending.append((right_child, level + 1, 2 * index + 1))
+            else:
+                yield level, index, value, None, None
+
+    def write_tree(self, out, height=6, root=9, left_branch=default_left, right_branch=default_right,
+                   fmt='ndjson', order='dfs'):
+        """
+        Пишет дерево в поток по мере обхода, не держа его в памяти.
+        out - текстовый поток для 'ndjson' или двоичный для 'binary'.
+        Возвращает количество записанных узлов.
+        """
+        records = self.iter_tree_records(height, root, left_branch, right_branch, order)
+        count = 0
+
+        if fmt == 'ndjson':
+            for level, index, value, left_child, right_child in records:
+                out.write(json.dumps({'level': level, 'index': index, 'value': value,
+                                      'left': left_child, 'right': right_child}))
+                out.write('\n')
+                count += 1
+        elif fmt == 'binary':
+            if height > 64:
+                raise OverflowError("Индекс узла не помещается в 64 бита")
+            out.write(BINARY_HEADER.pack(BINARY_MAGIC, max(height, 0)))
+            for level, index, value, _, _ in records:
+                try:
+                    out.write(BINARY_RECORD.pack(level, index, value))
+                except struct.error:
+                    raise OverflowError(f"Значение {value} не помещается в int64")
+                count += 1
+        else:
+            raise ValueError(f"Неизвестный формат: {fmt}")
+
+        return count
+
+    def read_binary_tree(self, file):
+        """
+        Читает файл формата write_tree(fmt='binary').
+        Возвращает высоту и генератор записей (уровень, индекс, значение).
+        """
+        magic, height = BINARY_HEADER.unpack(file.read(BINARY_HEADER.size))
+        if magic != BINARY_MAGIC:
+            raise ValueError("Файл не является двоичным деревом")
+
+        def records():
+            while True:
+                chunk = file.read(BINARY_RECORD.size)
+                if len(chunk) < BINARY_RECORD.size:
+                    return
+                yield BINARY_RECORD.unpack(chunk)
+
+        return height, records()
+
+    def gen_levels(self, height=6, root=9):
+        """Генератор уровней дерева в замкнутой форме (см. tree_levels.gen_levels)"""
+        return tree_levels.gen_levels(height, root)
+
+    level_closed_form = staticmethod(tree_levels.level_closed_form)
+
     def get_user_input(self):
         """Получает параметры дерева от пользователя"""
         print("Введите параметры бинарного дерева (или нажмите Enter для значений по умолчанию):")
@@ -60,26 +556,39 @@ class gen_tree:
         use_custom = input("Использовать пользовательские формулы для потомков? (y/n): ").lower().strip()
         
         if use_custom == 'y':
-            print("Введите формулы в виде Python выражений с переменной 'r' (например: r*2+1):")
-            left_formula = input("Левый потомок: ")
-            right_formula = input("Правый потомок: ")
-            
-            # Создаем функции из введенных формул
-            left_branch = eval(f"lambda r: {left_formula}")
-            right_branch = eval(f"lambda r: {right_formula}")
+            print("Введите формулы с переменной 'r' (например: r*2+1).")
+            print("Допустимы целые числа, скобки и операции + - * // % **")
+            left_branch = self.get_formula_from_user("Левый потомок: ")
+            right_branch = self.get_formula_from_user("Правый потомок: ")
         else:
-            left_branch = lambda r: r*2+1
-            right_branch = lambda r: 2*r-1
+            left_branch = default_left
+            right_branch = default_right
         
         return height, root, left_branch, right_branch
 
+    def get_formula_from_user(self, prompt):
+        """Запрашивает формулу, пока она не пройдет проверку"""
+        while True:
+            try:
+                return compile_formula(input(prompt))
+            except ValueError as e:
+                print(f"Недопустимая формула: {e}")
+
     def main(self):
         """Основная программа"""
         # Получаем параметры от пользователя
         height, root, left_func, right_func = self.get_user_input()
+
+        # Большие деревья не строим целиком, а пишем построчно (NDJSON)
+        if height >= STREAM_HEIGHT:
+            count = self.write_tree(sys.stdout, height, root, left_func, right_func)
+            print(f"Высота: {height}")
+            print(f"Корень: {root}")
+            print(f"Записано узлов: {count}")
+            return
         
         # Строим дерево
-        binary_tree = self.gen_bin_tree(height, root, left_func, right_func)
+        binary_tree = self.gen_bin_tree_fast(height, root, left_func, right_func)
         
         # Выводим результаты
         print(binary_tree)
@@ -1,6 +1,7 @@
 import unittest
 from collections import OrderedDict
-from gen_tree_5 import gen_tree
+import gen_tree_5
+from gen_tree_5 import gen_tree, compile_formula
 
 class TestGenTree(unittest.TestCase):
     
@@ -65,6 +66,22 @@ class TestGenTree(unittest.TestCase):
             self.assertEqual(result[leaf_node]['left'], None)
             self.assertEqual(result[leaf_node]['right'], None)
 
+    def test_gen_levels_closed_form(self):
+        """Уровни в замкнутой форме содержат те же узлы, что и дерево"""
+        levels = list(self.tree_gen.gen_levels(height=5, root=3))
+        self.assertEqual(len(levels), 5)
+        self.assertEqual(list(levels[1]), [7, 5])
+        values = [int(value) for level in levels for value in level]
+        self.assertEqual(list(OrderedDict.fromkeys(values)),
+                         list(self.tree_gen.gen_bin_tree(height=5, root=3)))
+
+    def test_gen_levels_big_int(self):
+        """Глубокие уровни не переполняются"""
+        level = self.tree_gen.level_closed_form(70, 9)
+        self.assertIsInstance(level, range)
+        self.assertEqual(level[0], 10 * 2 ** 70 - 1)
+        self.assertEqual(level[-1], 10 * 2 ** 70 - 1 - 2 * (2 ** 70 - 1))
+
 class TestGenTreeEdgeCases(unittest.TestCase):
     
     def setUp(self):
@@ -94,6 +111,202 @@ class TestGenTreeEdgeCases(unittest.TestCase):
         self.assertIn(-5, result)
         self.assertIn(-10, result)
 
+class TestFormula(unittest.TestCase):
+
+    def setUp(self):
+        self.tree_gen = gen_tree()
+
+    def test_formula_values(self):
+        """Формула считается как обычное выражение"""
+        formula = compile_formula("(r + 3) * 2 - r // 2 + r % 5 - r ** 2")
+        for r in (-7, 0, 1, 12):
+            self.assertEqual(formula(r), (r + 3) * 2 - r // 2 + r % 5 - r ** 2)
+
+    def test_formula_rejects_code(self):
+        """Все, кроме разрешенной грамматики, отклоняется"""
+        for text in ("__import__('os').system('echo hi')", "x + 1", "r / 2", "r ** r",
+                     "r ** 1000", "1.5 * r", "[r]", "r if r else 1", "r.bit_length()", "r +"):
+            with self.assertRaises(ValueError):
+                compile_formula(text)
+
+    def test_formula_rejects_nested_powers(self):
+        """Произведение вложенных показателей ограничено MAX_POWER"""
+        self.assertEqual(compile_formula("(r ** 8) ** 8")(2), 2 ** 64)
+        self.assertEqual(compile_formula("(r ** 2 + 1) ** 3")(2), 125)
+        for text in ("((((r**64)**64)**64)**64)", "(r ** 8) ** 9", "-(r ** 64) ** 2",
+                     "((r ** 64) ** 64) ** 0", "(10 ** 64) ** 64"):
+            with self.assertRaises(ValueError):
+                compile_formula(text)
+
+    def test_fast_builder_matches_original(self):
+        """Построение уровнями дает то же дерево, что и gen_bin_tree"""
+        rules = [
+            (None, None),
+            ("r*3-1", "r//2"),
+            ("r % 7", "r + 1"),
+            ("r ** 3 + 1", "-r"),
+        ]
+        for left_text, right_text in rules:
+            if left_text is None:
+                left, right = gen_tree_5.default_left, gen_tree_5.default_right
+            else:
+                left, right = compile_formula(left_text), compile_formula(right_text)
+            for height in range(0, 9):
+                self.assertEqual(self.tree_gen.gen_bin_tree_fast(height, 5, left, right),
+                                 self.tree_gen.gen_bin_tree(height, 5, left, right))
+
+    def test_fast_builder_big_values(self):
+        """Значения за пределами int64 считаются на int Python"""
+        left, right = compile_formula("r ** 4"), compile_formula("r * 1000003")
+        self.assertEqual(self.tree_gen.gen_bin_tree_fast(5, 3, left, right),
+                         self.tree_gen.gen_bin_tree(5, 3, left, right))
+
+    def test_fast_builder_plain_functions(self):
+        """Обычные функции тоже поддерживаются"""
+        left, right = (lambda r: r + 1), (lambda r: r + 2)
+        self.assertEqual(self.tree_gen.gen_bin_tree_fast(4, 1, left, right),
+                         self.tree_gen.gen_bin_tree(4, 1, left, right))
+
+    @unittest.skipIf(gen_tree_5.np is None, "NumPy не установлен")
+    def test_vectorized(self):
+        """Векторный расчет и отказ при переполнении"""
+        import numpy as np
+        formula = compile_formula("r * 2 + 1")
+        self.assertEqual(formula.vectorized(np.array([1, 2, 3])).tolist(), [3, 5, 7])
+        self.assertIsNone(compile_formula("r ** 5").vectorized(np.array([2 ** 20])))
+        self.assertIsNone(compile_formula("r // (r - 1)").vectorized(np.array([1, 2])))
+        self.assertEqual(compile_formula("7").vectorized(np.array([1, 2])).tolist(), [7, 7])
+
+
+class TestGenTreeDag(unittest.TestCase):
+
+    def setUp(self):
+        self.tree_gen = gen_tree()
+
+    def test_dag_matches_original(self):
+        """DAG-режим дает то же дерево, что и gen_bin_tree"""
+        rules = [
+            (gen_tree_5.default_left, gen_tree_5.default_right),
+            (lambda r: r + 1, lambda r: r + 2),
+            (lambda r: r // 2, lambda r: r % 3),
+            (lambda r: -r, lambda r: r * -2),
+            (lambda r: r, lambda r: r),
+        ]
+        for left, right in rules:
+            for height in range(0, 9):
+                tree, _ = self.tree_gen.gen_bin_tree_dag(height, 5, left, right)
+                self.assertEqual(tree, self.tree_gen.gen_bin_tree(height, 5, left, right))
+                self.assertEqual(list(tree), list(self.tree_gen.gen_bin_tree(height, 5, left, right)))
+
+    def test_dag_sharing_stats(self):
+        """При сильном пересечении значений работа растет линейно"""
+        calls = []
+
+        def left(r):
+            calls.append(r)
+            return r + 1
+
+        tree, stats = self.tree_gen.gen_bin_tree_dag(30, 0, left, lambda r: r + 2)
+        self.assertEqual(stats['logical_nodes'], 2 ** 30 - 1)
+        self.assertEqual(stats['distinct_values'], len(tree))
+        self.assertEqual(len(calls), len(set(calls)))
+        self.assertLess(stats['expanded_nodes'], 30 * 60)
+        self.assertGreater(stats['sharing_ratio'], 1000)
+
+    def test_dag_without_sharing(self):
+        """Без повторов коэффициент равен 1"""
+        _, stats = self.tree_gen.gen_bin_tree_dag(5, 9)
+        self.assertEqual(stats['logical_nodes'], 31)
+        self.assertEqual(stats['sharing_ratio'], 1.0)
+
+
+class TestGenTreeParallel(unittest.TestCase):
+
+    def setUp(self):
+        self.tree_gen = gen_tree()
+
+    def test_parallel_matches_original(self):
+        """Параллельное построение дает то же дерево"""
+        left, right = compile_formula("r * 3 + 1"), compile_formula("r // 2")
+        tree = self.tree_gen.gen_bin_tree_parallel(8, 7, left, right, workers=2, min_chunk=4)
+        self.assertEqual(tree, self.tree_gen.gen_bin_tree(8, 7, left, right))
+        self.assertEqual(list(tree), list(self.tree_gen.gen_bin_tree(8, 7, left, right)))
+
+    def test_parallel_default_rules(self):
+        """Правила по умолчанию"""
+        tree = self.tree_gen.gen_bin_tree_parallel(6, 9, workers=2, min_chunk=2)
+        self.assertEqual(tree, self.tree_gen.gen_bin_tree(6, 9))
+
+    def test_parallel_lambda_fallback(self):
+        """lambda не сериализуется - дерево строится в текущем процессе"""
+        left, right = (lambda r: r + 1), (lambda r: r - 1)
+        tree = self.tree_gen.gen_bin_tree_parallel(5, 0, left, right, workers=2, min_chunk=1)
+        self.assertEqual(tree, self.tree_gen.gen_bin_tree(5, 0, left, right))
+
+    def test_parallel_height_zero(self):
+        """Нулевая высота"""
+        self.assertEqual(self.tree_gen.gen_bin_tree_parallel(0), OrderedDict())
+
+
+class TestTreeStreaming(unittest.TestCase):
+
+    def setUp(self):
+        self.tree_gen = gen_tree()
+
+    def test_records_match_tree(self):
+        """Записи содержат те же узлы и потомков, что и дерево"""
+        tree = self.tree_gen.gen_bin_tree(5, 9)
+        for order in ('dfs', 'bfs'):
+            records = list(self.tree_gen.iter_tree_records(5, 9, order=order))
+            self.assertEqual(len(records), 31)
+            for level, index, value, left, right in records:
+                self.assertEqual((tree[value]['left'], tree[value]['right']), (left, right))
+
+    def test_bfs_order_matches_gen_bin_tree(self):
+        """Обход в ширину идет в порядке gen_bin_tree"""
+        values = [record[2] for record in self.tree_gen.iter_tree_records(6, 3, order='bfs')]
+        self.assertEqual(list(OrderedDict.fromkeys(values)), list(self.tree_gen.gen_bin_tree(6, 3)))
+
+    def test_dfs_memory_is_bounded(self):
+        """Прямой обход не накапливает узлы: глубокое дерево читается лениво"""
+        records = self.tree_gen.iter_tree_records(200, 1)
+        for _ in range(1000):
+            level, index, value, left, right = next(records)
+        self.assertLess(level, 200)
+
+    def test_write_ndjson(self):
+        """NDJSON: одна строка на узел"""
+        import io
+        import json
+        out = io.StringIO()
+        count = self.tree_gen.write_tree(out, 3, 4)
+        lines = out.getvalue().splitlines()
+        self.assertEqual(count, 7)
+        self.assertEqual(len(lines), 7)
+        self.assertEqual(json.loads(lines[0]),
+                         {'level': 0, 'index': 0, 'value': 4, 'left': 9, 'right': 7})
+        self.assertEqual(json.loads(lines[-1])['right'], None)
+
+    def test_write_binary_roundtrip(self):
+        """Двоичный формат читается обратно"""
+        import io
+        out = io.BytesIO()
+        count = self.tree_gen.write_tree(out, 4, -2, fmt='binary', order='bfs')
+        out.seek(0)
+        height, records = self.tree_gen.read_binary_tree(out)
+        values = [value for _, _, value in records]
+        self.assertEqual(height, 4)
+        self.assertEqual(len(values), count)
+        # В дереве с отрицательным корнем значения повторяются
+        self.assertEqual(list(OrderedDict.fromkeys(values)), list(self.tree_gen.gen_bin_tree(4, -2)))
+
+    def test_write_invalid_format(self):
+        """Неизвестный формат"""
+        import io
+        with self.assertRaises(ValueError):
+            self.tree_gen.write_tree(io.StringIO(), 2, 1, fmt='xml')
+
+
 if __name__ == '__main__':
     # Запуск тестов с минимальным выводом - только точки
     unittest.main(verbosity=0, exit=False)
\ No newline at end of file
@@ -1,6 +1,24 @@
+import csv
+import gc
+import json
+import os
+import sys
+import time
 import timeit
+import tracemalloc
+import matplotlib
+matplotlib.use('Agg')  # графики сохраняются в файлы, окно не нужно
 import matplotlib.pyplot as plt
+from array import array
 from collections import deque
+from functools import partial
+
+# Общий модуль замеров лежит в каталоге Labs
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from benchmark import BenchmarkRunner, ResultCache, register_suite
+
+# Начиная с этой высоты дерево выводится построчно, а не одним словарем
+STREAM_HEIGHT = 16
 
 class TreeNode:
     def __init__(self, val=0):
@@ -8,6 +26,38 @@ class TreeNode:
         self.left = None
         self.right = None
 
+class SlottedTreeNode:
+    """Узел без __dict__: атрибуты хранятся в фиксированных слотах"""
+    __slots__ = ('val', 'left', 'right')
+
+    def __init__(self, val=0):
+        self.val = val
+        self.left = None
+        self.right = None
+
+class NodePool:
+    """
+    Пул узлов в виде структуры массивов: val, left и right - массивы int64,
+    узел задается индексом, отсутствие потомка - индекс -1.
+    Память выделяется сразу на capacity узлов.
+    """
+
+    def __init__(self, capacity):
+        self.val = array('q', bytes(8 * capacity))
+        self.left = array('q', [-1]) * capacity
+        self.right = array('q', [-1]) * capacity
+        self.size = 0
+
+    def __len__(self):
+        return self.size
+
+    def new_node(self, val):
+        """Занимает следующий свободный узел и возвращает его индекс"""
+        index = self.size
+        self.val[index] = val
+        self.size += 1
+        return index
+
 def build_tree_recursive(height, root_val=9):
     """Рекурсивное построение бинарного дерева"""
     if height <= 0:
@@ -24,12 +74,12 @@ def build_tree_recursive(height, root_val=9):
     
     return build_node(root_val, 0)
 
-def build_tree_iterative(height, root_val=9):
+def build_tree_iterative(height, root_val=9, node_cls=TreeNode):
     """Итеративное построение бинарного дерева с использованием очереди"""
     if height <= 0:
         return None
     
-    root = TreeNode(root_val)
+    root = node_cls(root_val)
     queue = deque([(root, 0)])  # (node, current_height)
     
     while queue:
@@ -38,25 +88,90 @@ def build_tree_iterative(height, root_val=9):
         if current_height + 1 < height:
             # Создаем левого потомка
             left_val = node.val * 2 + 1
-            node.left = TreeNode(left_val)
+            node.left = node_cls(left_val)
             queue.append((node.left, current_height + 1))
             
             # Создаем правого потомка
             right_val = node.val * 2 - 1
-            node.right = TreeNode(right_val)
+            node.right = node_cls(right_val)
             queue.append((node.right, current_height + 1))
     
     return root
 
+def build_tree_pool(height, root_val=9):
+    """
+    Построение дерева в заранее выделенном пуле узлов.
+    Возвращает NodePool, корень - узел с индексом 0 (пустой пул при height <= 0).
+    """
+    if height <= 0:
+        return NodePool(0)
+
+    pool = NodePool(2 ** height - 1)
+    pool.new_node(root_val)
+    level_start, level_end = 0, 1
+
+    for _ in range(1, height):
+        for index in range(level_start, level_end):
+            val = pool.val[index]
+            pool.left[index] = pool.new_node(val * 2 + 1)
+            pool.right[index] = pool.new_node(val * 2 - 1)
+        level_start, level_end = level_end, pool.size
+
+    return pool
+
 def tree_to_dict(node):
-    """Преобразует дерево в словарь для удобства просмотра"""
+    """
+    Преобразует дерево в словарь для удобства просмотра.
+    Обход идет по явному стеку, поэтому глубина дерева не ограничена
+    лимитом рекурсии.
+    """
     if node is None:
         return None
-    return {
-        'val': node.val,
-        'left': tree_to_dict(node.left),
-        'right': tree_to_dict(node.right)
-    }
+
+    result = {'val': node.val, 'left': None, 'right': None}
+    stack = [(node, result)]
+    while stack:
+        current, current_dict = stack.pop()
+        for side in ('left', 'right'):
+            child = getattr(current, side)
+            if child is not None:
+                child_dict = {'val': child.val, 'left': None, 'right': None}
+                current_dict[side] = child_dict
+                stack.append((child, child_dict))
+    return result
+
+def iter_tree_rows(node):
+    """
+    Генератор плоских строк (id, val, left_id, right_id) обходом в ширину.
+    id выдаются по порядку обхода, отсутствующий потомок - None.
+    Память - O(ширины уровня), глубина не ограничена.
+    """
+    if node is None:
+        return
+
+    next_id = 1
+    queue = deque([(node, 0)])
+    while queue:
+        current, node_id = queue.popleft()
+        child_ids = []
+        for child in (current.left, current.right):
+            if child is None:
+                child_ids.append(None)
+            else:
+                child_ids.append(next_id)
+                queue.append((child, next_id))
+                next_id += 1
+        yield node_id, current.val, child_ids[0], child_ids[1]
+
+def export_tree(node, out):
+    """Пишет строки iter_tree_rows в текстовый поток как CSV, возвращает их число"""
+    writer = csv.writer(out)
+    writer.writerow(['id', 'val', 'left_id', 'right_id'])
+    count = 0
+    for row in iter_tree_rows(node):
+        writer.writerow(row)
+        count += 1
+    return count
 
 def get_user_input():
     """Получает параметры дерева от пользователя"""
@@ -78,53 +193,186 @@ def demonstrate_trees(root_val, height):
     # Рекурсивное построение
     print("Дерево построенное рекурсивным методом:")
     recursive_tree = build_tree_recursive(height, root_val)
-    recursive_dict = tree_to_dict(recursive_tree)
-    print(recursive_dict)
+    show_tree(recursive_tree, height)
     
     # Итеративное построение
     print("Дерево построенное итеративным методом:")
     iterative_tree = build_tree_iterative(height, root_val)
-    iterative_dict = tree_to_dict(iterative_tree)
-    print(iterative_dict)
+    show_tree(iterative_tree, height)
 
-# Функции для измерения времени
+def show_tree(node, height):
+    """Печатает дерево словарем, а большое дерево - построчно в CSV"""
+    if height >= STREAM_HEIGHT:
+        export_tree(node, sys.stdout)
+    else:
+        print(tree_to_dict(node))
+
+# Функции для измерения времени (суммарное время 10 построений)
 def time_recursive(height, root_val):
-    return timeit.timeit(lambda: build_tree_recursive(height, root_val), number=10)
+    return 10 * BenchmarkRunner(repeat=3, min_time=0.01).measure(
+        partial(build_tree_recursive, height, root_val))['min']
 
 def time_iterative(height, root_val):
-    return timeit.timeit(lambda: build_tree_iterative(height, root_val), number=10)
+    return 10 * BenchmarkRunner(repeat=3, min_time=0.01).measure(
+        partial(build_tree_iterative, height, root_val))['min']
 
-def compare_performance(root_val):
-    """Сравнивает производительность и строит график"""
-    heights = list(range(1, 10))
-    recursive_times = []
-    iterative_times = []
-    
-    print("Измерение времени для построения графиков...")
-    
+def build_tree_slotted(height, root_val=9):
+    """Итеративное построение на узлах с __slots__"""
+    return build_tree_iterative(height, root_val, SlottedTreeNode)
+
+# Методы построения: подпись, построитель, стиль линии
+BUILDERS = [
+    ('Рекурсивный метод', build_tree_recursive, 'b-'),
+    ('Итеративный метод', build_tree_iterative, 'r-'),
+    ('Итеративный, __slots__', build_tree_slotted, 'm-'),
+    ('Пул узлов', build_tree_pool, 'g-'),
+]
+
+# Код, от которого зависит результат каждого построителя (для ключа кэша)
+BUILDER_CODE = {
+    build_tree_recursive: [build_tree_recursive, TreeNode],
+    build_tree_iterative: [build_tree_iterative, TreeNode],
+    build_tree_slotted: [build_tree_slotted, build_tree_iterative, SlottedTreeNode],
+    build_tree_pool: [build_tree_pool, NodePool],
+}
+
+# Колонки таблицы результатов
+RESULT_FIELDS = ['builder', 'height', 'nodes', 'time_ms', 'peak_kb', 'bytes_per_node',
+                 'blocks_per_node', 'gc_collections', 'gc_pause_ms']
+
+@register_suite('lab6.trees')
+def trees_suite():
+    """Набор замеров для общего модуля benchmark"""
+    for _, build, _ in BUILDERS:
+        for height in (4, 8, 12):
+            yield f"{build.__name__}(height={height})", {'height': height}, partial(build, height, 9)
+
+def measure_builder(label, build, height, root_val):
+    """
+    Замеряет один метод построения на одной высоте:
+    среднее время, пиковую память (tracemalloc), а также сборки мусора
+    и паузы GC во время замера времени.
+
+    bytes_per_node и blocks_per_node - память и число блоков, которые
+    остаются занятыми после построения (то есть занимает само дерево),
+    а не все выделения, сделанные во время построения.
+    """
+    nodes = 2 ** height - 1
+    # Меньше повторов для больших деревьев, чтобы замер не длился минутами
+    number = max(1, min(10, 2 ** 14 // (nodes + 1)))
+
+    pauses = []
+    started = []
+
+    def on_gc(phase, info):
+        if phase == 'start':
+            started.append(time.perf_counter())
+        elif started:
+            pauses.append(time.perf_counter() - started.pop())
+
+    gc.callbacks.append(on_gc)
+    try:
+        # timeit по умолчанию отключает GC, а здесь паузы GC нужно увидеть
+        timer = timeit.Timer(lambda: build(height, root_val), setup='gc.enable()', globals={'gc': gc})
+        elapsed = timer.timeit(number=number)
+    finally:
+        gc.callbacks.remove(on_gc)
+
+    tracemalloc.start()
+    try:
+        tree = build(height, root_val)
+        current, peak = tracemalloc.get_traced_memory()
+        blocks = sum(stat.count for stat in tracemalloc.take_snapshot().statistics('filename'))
+    finally:
+        tracemalloc.stop()
+    del tree
+
+    return {
+        'builder': label,
+        'height': height,
+        'nodes': nodes,
+        'time_ms': elapsed / number * 1000,
+        'peak_kb': peak / 1024,
+        'bytes_per_node': current / nodes,
+        'blocks_per_node': blocks / nodes,
+        'gc_collections': len(pauses),
+        'gc_pause_ms': sum(pauses) * 1000,
+    }
+
+def run_benchmarks(root_val, heights=range(1, 19), cache=None):
+    """
+    Замеряет все методы построения, возвращает список строк-словарей.
+    Если задан cache (ResultCache), замеры неизмененного кода берутся из него.
+    """
+    results = []
     for height in heights:
-        # Измеряем время в миллисекундах
-        rec_time = time_recursive(height, root_val) * 1000
-        iter_time = time_iterative(height, root_val) * 1000
-        
-        recursive_times.append(rec_time)
-        iterative_times.append(iter_time)
-    
-    # Построение графика
-    plt.figure(figsize=(12, 8))
-    
-    # Убраны маркеры, оставлены только линии
-    plt.plot(heights, recursive_times, 'b-', label='Рекурсивный метод', linewidth=2)
-    plt.plot(heights, iterative_times, 'r-', label='Итеративный метод', linewidth=2)
-    
-    plt.xlabel('Высота дерева', fontsize=12)
-    plt.ylabel('Время построения (мс)', fontsize=12)
-    plt.title('Зависимость времени построения от высоты дерева', fontsize=14)
-    plt.grid(True, alpha=0.3)
-    plt.legend(fontsize=12)
-    
-    plt.tight_layout()
-    plt.show()
+        for label, build, _ in BUILDERS:
+            measure = partial(measure_builder, label, build, height, root_val)
+            if cache is None:
+                results.append(measure())
+            else:
+                code = BUILDER_CODE[build] + [measure_builder]
+                results.append(cache.get_or_measure(code, {'height': height, 'root_val': root_val}, measure))
+        print(f"Высота {height} измерена")
+    return results
+
+def save_results(results, output_dir):
+    """Сохраняет результаты в CSV и JSON, возвращает пути файлов"""
+    os.makedirs(output_dir, exist_ok=True)
+    csv_path = os.path.join(output_dir, 'tree_benchmark.csv')
+    json_path = os.path.join(output_dir, 'tree_benchmark.json')
+
+    with open(csv_path, 'w', newline='', encoding='utf-8') as file:
+        writer = csv.DictWriter(file, fieldnames=RESULT_FIELDS)
+        writer.writeheader()
+        writer.writerows(results)
+
+    with open(json_path, 'w', encoding='utf-8') as file:
+        json.dump(results, file, ensure_ascii=False, indent=2)
+
+    return csv_path, json_path
+
+def plot_results(results, path):
+    """Рисует графики в PNG-файл (без окна, backend Agg)"""
+    charts = [
+        ('time_ms', 'Время построения (мс)', 'Время построения'),
+        ('peak_kb', 'Пиковая память (КБ)', 'Пиковая память'),
+        ('blocks_per_node', 'Блоков памяти на узел', 'Блоки памяти на узел'),
+        ('gc_pause_ms', 'Паузы GC (мс)', 'Паузы сборщика мусора'),
+    ]
+    fig, axes = plt.subplots(2, 2, figsize=(16, 12))
+
+    for ax, (field, ylabel, title) in zip(axes.flat, charts):
+        # Убраны маркеры, оставлены только линии
+        for label, _, style in BUILDERS:
+            rows = [row for row in results if row['builder'] == label]
+            ax.plot([row['height'] for row in rows], [row[field] for row in rows],
+                    style, label=label, linewidth=2)
+        ax.set_xlabel('Высота дерева', fontsize=12)
+        ax.set_ylabel(ylabel, fontsize=12)
+        ax.set_title(title, fontsize=14)
+        ax.grid(True, alpha=0.3)
+        ax.legend(fontsize=10)
+
+    fig.tight_layout()
+    fig.savefig(path)
+    plt.close(fig)
+    return path
+
+def compare_performance(root_val=9, heights=range(1, 19), output_dir='results', use_cache=True):
+    """
+    Сравнивает методы построения по времени, памяти, блокам памяти и паузам GC.
+    Результаты сохраняются в output_dir (CSV, JSON и PNG), окно не открывается.
+    use_cache - не перемерять построители, код которых не менялся.
+    """
+    print("Измерение времени и памяти для построения графиков...")
+    cache = ResultCache() if use_cache else None
+    results = run_benchmarks(root_val, heights, cache)
+
+    csv_path, json_path = save_results(results, output_dir)
+    png_path = plot_results(results, os.path.join(output_dir, 'tree_benchmark.png'))
+    print(f"Результаты сохранены: {csv_path}, {json_path}, {png_path}")
+    return results
 
 def main():
     """Основная функция программы"""
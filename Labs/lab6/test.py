@@ -0,0 +1,139 @@
+import contextlib
+import csv
+import io
+import json
+import os
+import sys
+import tempfile
+import unittest
+
+from comparison import (BUILDERS, RESULT_FIELDS, NodePool, SlottedTreeNode, TreeNode,
+                        build_tree_iterative, build_tree_pool, build_tree_recursive,
+                        build_tree_slotted, compare_performance, export_tree, iter_tree_rows,
+                        tree_to_dict)
+
+
+def pool_to_dict(pool, index=0):
+    """Словарь того же вида, что tree_to_dict, для дерева в NodePool"""
+    if index >= len(pool):
+        return None
+    left, right = pool.left[index], pool.right[index]
+    return {
+        'val': pool.val[index],
+        'left': pool_to_dict(pool, left) if left != -1 else None,
+        'right': pool_to_dict(pool, right) if right != -1 else None,
+    }
+
+
+class TestBuilders(unittest.TestCase):
+
+    def test_builders_match(self):
+        """Все способы построения дают одно и то же дерево"""
+        for height in range(0, 8):
+            for root_val in (9, 0, -4):
+                expected = tree_to_dict(build_tree_recursive(height, root_val))
+                self.assertEqual(tree_to_dict(build_tree_iterative(height, root_val)), expected)
+                self.assertEqual(tree_to_dict(build_tree_slotted(height, root_val)), expected)
+                self.assertEqual(pool_to_dict(build_tree_pool(height, root_val)), expected)
+
+    def test_slotted_node(self):
+        root = build_tree_slotted(3, 9)
+        self.assertIsInstance(root, SlottedTreeNode)
+        self.assertFalse(hasattr(root, '__dict__'))
+
+    def test_pool(self):
+        pool = build_tree_pool(4, 9)
+        self.assertEqual(len(pool), 2 ** 4 - 1)
+        self.assertEqual((pool.val[0], pool.left[0], pool.right[0]), (9, 1, 2))
+        self.assertEqual((pool.val[1], pool.val[2]), (19, 17))
+        # У листьев нет потомков
+        self.assertEqual(set(pool.left[7:]), {-1})
+        self.assertEqual(set(pool.right[7:]), {-1})
+        self.assertEqual(len(build_tree_pool(0)), 0)
+
+    def test_pool_new_node(self):
+        pool = NodePool(2)
+        self.assertEqual(pool.new_node(5), 0)
+        self.assertEqual(pool.new_node(-7), 1)
+        self.assertEqual(list(pool.val), [5, -7])
+        self.assertEqual(list(pool.left), [-1, -1])
+
+
+class TestTreeExport(unittest.TestCase):
+
+    def test_tree_to_dict(self):
+        tree = tree_to_dict(build_tree_iterative(2, 9))
+        self.assertEqual(tree, {'val': 9,
+                                'left': {'val': 19, 'left': None, 'right': None},
+                                'right': {'val': 17, 'left': None, 'right': None}})
+        self.assertIsNone(tree_to_dict(None))
+
+    def test_tree_to_dict_deeper_than_recursion_limit(self):
+        """Вырожденное дерево глубже лимита рекурсии"""
+        depth = sys.getrecursionlimit() * 3
+        root = TreeNode(0)
+        node = root
+        for val in range(1, depth):
+            node.left = TreeNode(val)
+            node = node.left
+
+        current = tree_to_dict(root)
+        count = 0
+        while current is not None:
+            self.assertEqual(current['val'], count)
+            self.assertIsNone(current['right'])
+            current = current['left']
+            count += 1
+        self.assertEqual(count, depth)
+
+    def test_iter_tree_rows(self):
+        rows = list(iter_tree_rows(build_tree_iterative(3, 9)))
+        self.assertEqual(rows, [
+            (0, 9, 1, 2),
+            (1, 19, 3, 4),
+            (2, 17, 5, 6),
+            (3, 39, None, None),
+            (4, 37, None, None),
+            (5, 35, None, None),
+            (6, 33, None, None),
+        ])
+        self.assertEqual(list(iter_tree_rows(None)), [])
+
+    def test_export_tree(self):
+        out = io.StringIO()
+        count = export_tree(build_tree_iterative(2, 9), out)
+        self.assertEqual(count, 3)
+        self.assertEqual(out.getvalue().splitlines(),
+                         ['id,val,left_id,right_id', '0,9,1,2', '1,19,,', '2,17,,'])
+
+
+class TestHarness(unittest.TestCase):
+
+    def test_compare_performance(self):
+        """Замеры сохраняются в CSV, JSON и PNG"""
+        with tempfile.TemporaryDirectory() as output_dir:
+            with contextlib.redirect_stdout(io.StringIO()):
+                results = compare_performance(heights=range(1, 4), output_dir=output_dir,
+                                              use_cache=False)
+
+            self.assertEqual(len(results), 3 * len(BUILDERS))
+            for row in results:
+                self.assertEqual(list(row), RESULT_FIELDS)
+                self.assertEqual(row['nodes'], 2 ** row['height'] - 1)
+                self.assertGreater(row['time_ms'], 0)
+
+            with open(os.path.join(output_dir, 'tree_benchmark.csv'), encoding='utf-8') as file:
+                rows = list(csv.DictReader(file))
+            self.assertEqual(list(rows[0]), RESULT_FIELDS)
+            self.assertEqual(len(rows), len(results))
+
+            with open(os.path.join(output_dir, 'tree_benchmark.json'), encoding='utf-8') as file:
+                self.assertEqual(json.load(file), results)
+
+            png_path = os.path.join(output_dir, 'tree_benchmark.png')
+            self.assertTrue(os.path.exists(png_path))
+            self.assertGreater(os.path.getsize(png_path), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,6 +1,11 @@
 import sys
 import io
+import atexit
+import itertools
 import logging
+import queue
+import reprlib
+import threading
 from functools import wraps
 from typing import Callable, Any
 import requests
@@ -8,59 +13,307 @@ import json
 from datetime import datetime
 
 
-def logger(func: Callable = None, *, handle=sys.stdout) -> Callable:
+class AsyncLogWriter:
+    """
+    Фоновая запись логов для декоратора logger.
+
+    Записи кладутся в ограниченную очередь, а отдельный поток забирает их
+    пачками до batch_size штук и пишет одним вызовом write/flush (или
+    передает в logging.Logger). При переполнении очереди поведение задает
+    overflow:
+        'block'  - вызывающий поток ждет свободного места;
+        'drop'   - запись отбрасывается (счетчик dropped);
+        'sample' - сохраняется каждая sample_every-я лишняя запись, остальные
+                   отбрасываются.
+
+    Ошибка записи не останавливает фоновый поток: она выводится в
+    sys.stderr и учитывается в счетчике errors. После close записи
+    пишутся синхронно в вызывающем потоке.
+    """
+
+    OVERFLOW_MODES = ('block', 'drop', 'sample')
+
+    _STOP = object()
+
+    def __init__(self, handle, queue_size=1000, overflow='block', batch_size=100, sample_every=10,
+                 close_timeout=5.0):
+        if overflow not in self.OVERFLOW_MODES:
+            raise ValueError(f"Неизвестный режим переполнения: {overflow}")
+        if sample_every < 1:
+            raise ValueError("sample_every должно быть не меньше 1")
+        self.handle = handle
+        self.overflow = overflow
+        self.batch_size = batch_size
+        self.sample_every = sample_every
+        self.close_timeout = close_timeout
+        # Параметры, с которыми создан писатель (см. get_async_writer)
+        self.options = {'queue_size': queue_size, 'overflow': overflow,
+                        'batch_size': batch_size, 'sample_every': sample_every}
+        self.dropped = 0
+        self.errors = 0
+        self._overflowed = 0
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="AsyncLogWriter", daemon=True)
+        self._thread.start()
+        # Дописываем очередь при завершении программы
+        atexit.register(self.close)
+
+    @property
+    def closed(self):
+        return self._closed
+
+    def put(self, level, message):
+        """Ставит запись (уровень logging, текст) в очередь"""
+        record = (level, message)
+        if self._closed or not self._thread.is_alive():
+            # Фоновый поток уже остановлен - пишем сразу, чтобы не потерять запись
+            self._safe_write([record])
+            return
+
+        if self.overflow == 'block':
+            self._queue.put(record)
+            return
+
+        try:
+            self._queue.put_nowait(record)
+        except queue.Full:
+            self._overflowed += 1
+            if self.overflow == 'sample' and self._overflowed % self.sample_every == 0:
+                self._queue.put(record)
+            else:
+                self.dropped += 1
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            stop = any(record is self._STOP for record in batch)
+            records = [record for record in batch if record is not self._STOP]
+            try:
+                if records:
+                    self._safe_write(records)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+            if stop:
+                return
+
+    def _safe_write(self, records):
+        """Пишет записи; ошибка выводится в stderr и не прерывает работу"""
+        try:
+            self._write(records)
+        except Exception as e:
+            self.errors += 1
+            sys.stderr.write(f"AsyncLogWriter: не удалось записать {len(records)} "
+                             f"записей: {type(e).__name__}: {e}\n")
+
+    def _write(self, records):
+        if isinstance(self.handle, logging.Logger):
+            for level, message in records:
+                self.handle.log(level, message)
+            return
+
+        self.handle.write(''.join(f"{logging.getLevelName(level)}: {message}\n"
+                                  for level, message in records))
+        if hasattr(self.handle, 'flush'):
+            self.handle.flush()
+
+    def flush(self):
+        """Ждет, пока все поставленные записи будут записаны"""
+        if self._thread.is_alive():
+            self._queue.join()
+
+    def close(self):
+        """Дописывает очередь и останавливает фоновый поток"""
+        if self._closed:
+            return
+        self._closed = True
+        atexit.unregister(self.close)
+        _release_writer(self)
+        if self._thread.is_alive():
+            try:
+                self._queue.put(self._STOP, timeout=self.close_timeout)
+            except queue.Full:
+                pass
+            else:
+                self._thread.join(self.close_timeout)
+
+        # Записи, попавшие в очередь во время остановки, дописываем сами
+        leftover = []
+        while True:
+            try:
+                record = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if record is not self._STOP:
+                leftover.append(record)
+            self._queue.task_done()
+        if leftover:
+            self._safe_write(leftover)
+
+
+# Один фоновый писатель на каждый handle: записи всех декорированных функций
+# идут через общую очередь и сохраняют порядок
+_writers = {}
+_writers_lock = threading.Lock()
+
+
+def get_async_writer(handle, queue_size=1000, overflow='block', batch_size=100,
+                     sample_every=10) -> AsyncLogWriter:
+    """
+    Возвращает общий AsyncLogWriter для handle, создавая его при первом вызове.
+
+    Пока писатель не закрыт, все вызовы получают тот же объект; если
+    параметры очереди отличаются от параметров существующего писателя,
+    вызывается ValueError.
+    """
+    options = {'queue_size': queue_size, 'overflow': overflow,
+               'batch_size': batch_size, 'sample_every': sample_every}
+    with _writers_lock:
+        writer = _writers.get(id(handle))
+        if writer is None or writer.closed:
+            writer = AsyncLogWriter(handle, **options)
+            _writers[id(handle)] = writer
+        elif writer.options != options:
+            raise ValueError(f"Для этого handle уже есть AsyncLogWriter с параметрами "
+                             f"{writer.options}, запрошены {options}")
+        return writer
+
+
+def _release_writer(writer: AsyncLogWriter) -> None:
+    """Убирает закрытый писатель из реестра общих писателей"""
+    with _writers_lock:
+        if _writers.get(id(writer.handle)) is writer:
+            del _writers[id(writer.handle)]
+
+
+class _LazyText:
+    """Текст, который вычисляется только при форматировании записи"""
+    __slots__ = ('func', 'value')
+
+    def __init__(self, func: Callable, value: Any):
+        self.func = func
+        self.value = value
+
+    def __str__(self) -> str:
+        return self.func(self.value)
+
+
+def _limited_repr(max_repr: int) -> Callable:
+    """repr с ограничением длины: большие объекты не форматируются целиком"""
+    limiter = reprlib.Repr()
+    limiter.maxstring = max_repr
+    limiter.maxother = max_repr
+    limiter.maxlong = max_repr
+
+    def limited(value: Any) -> str:
+        text = limiter.repr(value)
+        if len(text) > max_repr:
+            text = text[:max(max_repr - 3, 0)] + '...'
+        return text
+
+    return limited
+
+
+def logger(func: Callable = None, *, handle=sys.stdout, async_mode: bool = False,
+           queue_size: int = 1000, overflow: str = 'block', batch_size: int = 100,
+           sample_every: int = 10, max_repr: int = None, sample_rate: float = 1.0) -> Callable:
     """
     Декоратор для логирования вызовов функций.
     
     Args:
         func: Декорируемая функция (если используется как @logger)
         handle: Объект для логирования (sys.stdout, файл, или logging.Logger)
+        async_mode: Писать логи в фоновом потоке через очередь. Все функции с
+                    одним handle используют общий AsyncLogWriter, поэтому
+                    параметры очереди у них должны совпадать (иначе ValueError)
+        queue_size: Размер очереди в асинхронном режиме
+        overflow: Поведение при переполнении очереди: 'block', 'drop' или 'sample'
+        batch_size: Максимум записей, записываемых фоновым потоком за раз
+        sample_every: В режиме 'sample' сохраняется каждая sample_every-я
+                      запись сверх размера очереди
+        max_repr: Максимальная длина представления аргументов и результата
+                  (None - без ограничения)
+        sample_rate: Доля логируемых вызовов от 0 до 1; ошибки логируются всегда
         
     Returns:
-        Декорированная функция
+        Декорированная функция (в асинхронном режиме у нее есть атрибут
+        log_writer для flush/close)
+
+    Для logging.Logger сообщение не форматируется, если его уровень
+    отключен (isEnabledFor), а аргументы форматируются лениво - только
+    когда запись действительно выводится.
     """
+    if not 0 <= sample_rate <= 1:
+        raise ValueError("sample_rate должен быть от 0 до 1")
+
     def decorator(original_func: Callable) -> Callable:
+        writer = None
+        if async_mode:
+            writer = get_async_writer(handle, queue_size=queue_size, overflow=overflow,
+                                      batch_size=batch_size, sample_every=sample_every)
+
+        # Определяем способ логирования
+        is_logger = isinstance(handle, logging.Logger)
+
+        # Представление аргументов и результата
+        show = str if max_repr is None else _limited_repr(max_repr)
+
+        # Номера вызовов для детерминированной выборки
+        calls = itertools.count()
+
+        def emit(level: int, template: str, *values: Any) -> None:
+            if is_logger and not handle.isEnabledFor(level):
+                return
+            if writer is not None:
+                writer.put(level, template % values)
+            elif is_logger:
+                handle.log(level, template, *values)
+            else:
+                handle.write(f"{logging.getLevelName(level)}: {template % values}\n")
+                if hasattr(handle, 'flush'):
+                    handle.flush()
+
         @wraps(original_func)
         def wrapper(*args: Any, **kwargs: Any) -> Any:
-            # Определяем способ логирования
-            is_logger = isinstance(handle, logging.Logger)
-            
             # Логируем начало выполнения
             func_name = original_func.__name__
-            
-            if is_logger:
-                handle.info(f"Calling {func_name} with args={args}, kwargs={kwargs}")
+
+            # Логируется вызов, на котором накопленная доля переходит через целое
+            if sample_rate >= 1:
+                sampled = True
             else:
-                handle.write(f"INFO: Calling {func_name} with args={args}, kwargs={kwargs}\n")
-                if hasattr(handle, 'flush'):
-                    handle.flush()
+                number = next(calls)
+                sampled = int((number + 1) * sample_rate) > int(number * sample_rate)
+            
+            if sampled:
+                emit(logging.INFO, "Calling %s with args=%s, kwargs=%s",
+                     func_name, _LazyText(show, args), _LazyText(show, kwargs))
             
             try:
                 # Выполняем функцию
                 result = original_func(*args, **kwargs)
                 
                 # Логируем успешное завершение
-                if is_logger:
-                    handle.info(f"{func_name} returned {result}")
-                else:
-                    handle.write(f"INFO: {func_name} returned {result}\n")
-                    if hasattr(handle, 'flush'):
-                        handle.flush()
+                if sampled:
+                    emit(logging.INFO, "%s returned %s", func_name, _LazyText(show, result))
                 
                 return result
                 
             except Exception as e:
                 # Логируем ошибку
-                if is_logger:
-                    handle.error(f"Function {func_name} raised {type(e).__name__}: {str(e)}")
-                else:
-                    handle.write(f"ERROR: Function {func_name} raised {type(e).__name__}: {str(e)}\n")
-                    if hasattr(handle, 'flush'):
-                        handle.flush()
+                emit(logging.ERROR, "Function %s raised %s: %s", func_name, type(e).__name__, _LazyText(str, e))
                 
                 # Пробрасываем исключение дальше
                 raise
         
+        wrapper.log_writer = writer
         return wrapper
     
     # Обработка вызова декоратора с аргументами и без
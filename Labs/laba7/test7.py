@@ -376,6 +376,284 @@ class TestFileLogging(unittest.TestCase):
                     pass
 
 
+class TestAsyncLogger(unittest.TestCase):
+    """Тестирование асинхронного режима декоратора logger"""
+
+    def test_async_writes_in_background(self):
+        """Записи попадают в поток после flush"""
+        stream = io.StringIO()
+
+        @lab7.logger(handle=stream, async_mode=True)
+        def add(a, b):
+            return a + b
+
+        for i in range(50):
+            self.assertEqual(add(i, 1), i + 1)
+        add.log_writer.flush()
+
+        lines = stream.getvalue().splitlines()
+        self.assertEqual(len(lines), 100)
+        self.assertEqual(lines[0], "INFO: Calling add with args=(0, 1), kwargs={}")
+        self.assertEqual(lines[1], "INFO: add returned 1")
+        add.log_writer.close()
+
+    def test_async_exception_logged(self):
+        """Ошибки тоже пишутся в фоне"""
+        stream = io.StringIO()
+
+        @lab7.logger(handle=stream, async_mode=True)
+        def fail():
+            raise ValueError("boom")
+
+        with self.assertRaises(ValueError):
+            fail()
+        fail.log_writer.close()
+        self.assertIn("ERROR: Function fail raised ValueError: boom", stream.getvalue())
+
+    def test_async_with_logging_logger(self):
+        """Асинхронная запись в logging.Logger"""
+        log = logging.getLogger("test_async")
+        log.handlers = []
+        messages = []
+
+        class TestHandler(logging.Handler):
+            def emit(self, record):
+                messages.append((record.levelname, record.getMessage()))
+
+        log.addHandler(TestHandler())
+        log.setLevel(logging.INFO)
+
+        @lab7.logger(handle=log, async_mode=True)
+        def square(x):
+            return x * x
+
+        square(3)
+        square.log_writer.close()
+        self.assertEqual(messages, [("INFO", "Calling square with args=(3,), kwargs={}"),
+                                    ("INFO", "square returned 9")])
+
+    def test_async_drop_on_overflow(self):
+        """Режим drop отбрасывает записи, если очередь заполнена"""
+        import threading
+        release = threading.Event()
+
+        class SlowStream(io.StringIO):
+            def write(self, text):
+                release.wait()
+                return super().write(text)
+
+        stream = SlowStream()
+
+        @lab7.logger(handle=stream, async_mode=True, queue_size=2, overflow='drop')
+        def noop():
+            return None
+
+        for _ in range(20):
+            noop()
+        release.set()
+        noop.log_writer.close()
+
+        writer = noop.log_writer
+        self.assertGreater(writer.dropped, 0)
+        self.assertEqual(len(stream.getvalue().splitlines()) + writer.dropped, 40)
+
+    def test_async_invalid_overflow(self):
+        """Неизвестный режим переполнения"""
+        with self.assertRaises(ValueError):
+            lab7.logger(handle=io.StringIO(), async_mode=True, overflow='ignore')(lambda: None)
+
+    def test_async_write_error_keeps_thread(self):
+        """Ошибка записи не останавливает фоновый поток и не блокирует вызовы"""
+        class BrokenStream(io.StringIO):
+            fail = True
+
+            def write(self, text):
+                if self.fail:
+                    self.fail = False
+                    raise OSError("disk full")
+                return super().write(text)
+
+        stream = BrokenStream()
+
+        @lab7.logger(handle=stream, async_mode=True, queue_size=2, batch_size=1)
+        def noop():
+            return None
+
+        with patch('sys.stderr', new_callable=io.StringIO) as stderr:
+            for _ in range(10):
+                noop()
+            noop.log_writer.flush()
+            noop.log_writer.close()
+
+        self.assertEqual(noop.log_writer.errors, 1)
+        self.assertIn("OSError: disk full", stderr.getvalue())
+        self.assertEqual(len(stream.getvalue().splitlines()), 19)
+
+    def test_async_shared_writer_per_handle(self):
+        """Функции с одним handle используют общий писатель и сохраняют порядок"""
+        stream = io.StringIO()
+
+        @lab7.logger(handle=stream, async_mode=True)
+        def inner(x):
+            return x + 1
+
+        @lab7.logger(handle=stream, async_mode=True)
+        def outer(x):
+            return inner(x) * 2
+
+        self.assertIs(inner.log_writer, outer.log_writer)
+        outer(1)
+        outer.log_writer.close()
+        self.assertEqual(stream.getvalue().splitlines(), [
+            "INFO: Calling outer with args=(1,), kwargs={}",
+            "INFO: Calling inner with args=(1,), kwargs={}",
+            "INFO: inner returned 2",
+            "INFO: outer returned 4",
+        ])
+
+    def test_async_conflicting_options(self):
+        """Другие параметры очереди для того же handle - ошибка, а не тихая подмена"""
+        stream = io.StringIO()
+
+        @lab7.logger(handle=stream, async_mode=True)
+        def first():
+            return None
+
+        with self.assertRaises(ValueError):
+            lab7.logger(handle=stream, async_mode=True, overflow='drop', queue_size=10)(lambda: None)
+
+        # После закрытия можно создать писатель с другими параметрами
+        first.log_writer.close()
+        second = lab7.logger(handle=stream, async_mode=True, overflow='drop', queue_size=10)(lambda: None)
+        self.assertEqual(second.log_writer.overflow, 'drop')
+        second.log_writer.close()
+
+    def test_async_sample_every(self):
+        """sample_every передается писателю в режиме 'sample'"""
+        import threading
+        release = threading.Event()
+
+        class SlowStream(io.StringIO):
+            def write(self, text):
+                release.wait()
+                return super().write(text)
+
+        stream = SlowStream()
+
+        @lab7.logger(handle=stream, async_mode=True, queue_size=1, batch_size=1,
+                     overflow='sample', sample_every=1000)
+        def noop():
+            return None
+
+        self.assertEqual(noop.log_writer.sample_every, 1000)
+        for _ in range(20):
+            noop()
+        release.set()
+        noop.log_writer.close()
+        self.assertEqual(len(stream.getvalue().splitlines()) + noop.log_writer.dropped, 40)
+        with self.assertRaises(ValueError):
+            lab7.logger(handle=io.StringIO(), async_mode=True, overflow='sample', sample_every=0)(noop)
+
+    def test_async_put_after_close_writes(self):
+        """После close записи пишутся синхронно, а не теряются"""
+        stream = io.StringIO()
+
+        @lab7.logger(handle=stream, async_mode=True)
+        def square(x):
+            return x * x
+
+        square.log_writer.close()
+        square(2)
+        self.assertEqual(stream.getvalue().splitlines(), [
+            "INFO: Calling square with args=(2,), kwargs={}",
+            "INFO: square returned 4",
+        ])
+
+
+class TestLazyLogger(unittest.TestCase):
+    """Тестирование ленивого форматирования, ограничения repr и выборки"""
+
+    def test_disabled_level_skips_formatting(self):
+        """Если уровень INFO отключен, аргументы не форматируются"""
+        log = logging.getLogger("test_lazy_disabled")
+        log.handlers = []
+        log.addHandler(logging.NullHandler())
+        log.setLevel(logging.WARNING)
+        formatted = []
+
+        class Expensive:
+            def __repr__(self):
+                formatted.append(1)
+                return "Expensive()"
+
+        @lab7.logger(handle=log)
+        def identity(x):
+            return x
+
+        identity(Expensive())
+        self.assertEqual(formatted, [])
+
+    def test_enabled_level_formats_message(self):
+        """Включенный уровень дает обычное сообщение"""
+        log = logging.getLogger("test_lazy_enabled")
+        log.handlers = []
+        messages = []
+
+        class TestHandler(logging.Handler):
+            def emit(self, record):
+                messages.append(record.getMessage())
+
+        log.addHandler(TestHandler())
+        log.setLevel(logging.INFO)
+
+        @lab7.logger(handle=log)
+        def pair(a, b=2):
+            return (a, b)
+
+        pair(1, b=3)
+        self.assertEqual(messages, ["Calling pair with args=(1,), kwargs={'b': 3}",
+                                    "pair returned (1, 3)"])
+
+    def test_max_repr_truncates(self):
+        """Большие аргументы и результат укорачиваются"""
+        stream = io.StringIO()
+
+        @lab7.logger(handle=stream, max_repr=30)
+        def echo(data):
+            return data
+
+        echo("x" * 10000)
+        lines = stream.getvalue().splitlines()
+        self.assertEqual(len(lines), 2)
+        for line in lines:
+            self.assertLess(len(line), 100)
+
+    def test_sample_rate(self):
+        """Логируется заданная доля вызовов, ошибки - всегда"""
+        stream = io.StringIO()
+
+        @lab7.logger(handle=stream, sample_rate=0.25)
+        def check(x):
+            if x < 0:
+                raise ValueError("negative")
+            return x
+
+        for i in range(100):
+            check(i)
+        with self.assertRaises(ValueError):
+            check(-1)
+
+        logs = stream.getvalue()
+        self.assertEqual(logs.count("INFO: Calling check"), 25)
+        self.assertEqual(logs.count("INFO: check returned"), 25)
+        self.assertIn("ERROR: Function check raised ValueError: negative", logs)
+
+    def test_invalid_sample_rate(self):
+        """Доля вне отрезка [0, 1]"""
+        with self.assertRaises(ValueError):
+            lab7.logger(handle=io.StringIO(), sample_rate=1.5)
+
+
 if __name__ == '__main__':
     # Запускаем тесты
     unittest.main(verbosity=0)  
\ No newline at end of file
@@ -0,0 +1,220 @@
+import contextlib
+import importlib.util
+import io
+import os
+import tempfile
+import unittest
+
+import benchmark
+from benchmark import BenchmarkRunner, ResultCache, ResultStore, compare_runs, register_suite
+
+
+class FakeClock:
+    """Таймер для тестов: время идет только тогда, когда его двигают"""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def work(self, seconds):
+        """Функция без аргументов, которая 'работает' seconds секунд"""
+        def func():
+            self.now += seconds
+        return func
+
+
+class TestBenchmarkRunner(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = FakeClock()
+
+    def test_calibrate(self):
+        # Времена - двоичные дроби, чтобы суммы считались точно
+        runner = BenchmarkRunner(min_time=0.25, timer=self.clock)
+        # 1, 2, 5 вызовов по 1/16 с - замер длиннее 0.25 с
+        self.assertEqual(runner.calibrate(self.clock.work(1 / 16)), 5)
+        # 1, 2, 5, 10, 20, 50, 100 вызовов по 1/256 с
+        self.assertEqual(runner.calibrate(self.clock.work(1 / 256)), 100)
+        self.assertEqual(runner.calibrate(self.clock.work(1.0)), 1)
+
+    def test_measure(self):
+        runner = BenchmarkRunner(warmup=2, repeat=5, min_time=0.25, timer=self.clock)
+        calls = []
+        work = self.clock.work(1 / 16)
+
+        def func():
+            calls.append(1)
+            work()
+
+        stats = runner.measure(func)
+        self.assertAlmostEqual(stats['min'], 1 / 16)
+        self.assertAlmostEqual(stats['median'], 1 / 16)
+        self.assertAlmostEqual(stats['iqr'], 0.0)
+        self.assertEqual((stats['number'], stats['repeat']), (5, 5))
+        # Прогрев, подбор (1 + 2 + 5 вызовов) и 5 замеров по 5 вызовов
+        self.assertEqual(len(calls), 2 + 8 + 25)
+
+    def test_measure_statistics(self):
+        costs = iter([1.0] + [0.1, 0.2, 0.3, 0.4, 0.5])
+        runner = BenchmarkRunner(warmup=0, repeat=5, min_time=0.5, timer=self.clock)
+
+        def func():
+            self.clock.now += next(costs)
+
+        stats = runner.measure(func)
+        self.assertEqual(stats['number'], 1)
+        self.assertAlmostEqual(stats['min'], 0.1)
+        self.assertAlmostEqual(stats['median'], 0.3)
+        self.assertAlmostEqual(stats['mean'], 0.3)
+        self.assertLess(stats['q1'], stats['median'])
+        self.assertGreater(stats['q3'], stats['median'])
+
+    def test_measure_single_repeat(self):
+        runner = BenchmarkRunner(warmup=0, repeat=1, min_time=0, timer=self.clock)
+        stats = runner.measure(self.clock.work(0.25))
+        self.assertEqual((stats['q1'], stats['median'], stats['q3']), (0.25, 0.25, 0.25))
+        self.assertEqual(stats['iqr'], 0)
+
+    def test_invalid_repeat(self):
+        with self.assertRaises(ValueError):
+            BenchmarkRunner(repeat=0)
+
+    def test_run_suite(self):
+        @register_suite('test.fake')
+        def fake_suite():
+            for seconds in (0.01, 0.02):
+                yield f"work({seconds})", {'seconds': seconds}, self.clock.work(seconds)
+
+        self.addCleanup(benchmark.SUITES.pop, 'test.fake')
+        self.assertIs(benchmark.SUITES['test.fake'], fake_suite)
+
+        runner = BenchmarkRunner(warmup=0, repeat=3, min_time=0.05, timer=self.clock)
+        with contextlib.redirect_stdout(io.StringIO()):
+            run = runner.run_suite('test.fake')
+
+        self.assertEqual(run['suite'], 'test.fake')
+        self.assertEqual(run['runner'], {'warmup': 0, 'repeat': 3, 'min_time': 0.05})
+        self.assertIn('python', run['environment'])
+        self.assertEqual([result['case'] for result in run['results']], ['work(0.01)', 'work(0.02)'])
+        self.assertEqual(run['results'][1]['params'], {'seconds': 0.02})
+        self.assertAlmostEqual(run['results'][1]['median'], 0.02)
+
+    def test_run_unknown_suite(self):
+        with self.assertRaises(KeyError):
+            BenchmarkRunner().run_suite('test.missing')
+
+
+class TestResultStore(unittest.TestCase):
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.store = ResultStore(os.path.join(directory.name, 'results.jsonl'))
+
+    def test_empty(self):
+        self.assertEqual(self.store.load(), [])
+        self.assertIsNone(self.store.previous('lab4.factorial'))
+
+    def test_append_load_previous(self):
+        runs = [
+            {'suite': 'a', 'results': [], 'n': 1},
+            {'suite': 'b', 'results': [], 'n': 2},
+            {'suite': 'a', 'results': [], 'n': 3},
+        ]
+        for run in runs:
+            self.store.append(run)
+
+        self.assertEqual(self.store.load(), runs)
+        self.assertEqual(self.store.load('a'), [runs[0], runs[2]])
+        self.assertEqual(self.store.previous('a'), runs[2])
+        self.assertEqual(self.store.previous('b'), runs[1])
+        self.assertIsNone(self.store.previous('c'))
+
+
+class TestResultCache(unittest.TestCase):
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+        self.path = os.path.join(self.directory, 'cache.json')
+        self.calls = []
+
+    def measure(self, value):
+        def func():
+            self.calls.append(value)
+            return value
+        return func
+
+    def load_function(self, name, body):
+        """Пишет модуль с функцией f и импортирует ее"""
+        path = os.path.join(self.directory, f'{name}.py')
+        with open(path, 'w', encoding='utf-8') as file:
+            file.write(f"def f():\n    {body}\n")
+        spec = importlib.util.spec_from_file_location(name, path)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        return module.f
+
+    def test_hit_and_miss(self):
+        cache = ResultCache(self.path)
+        self.assertEqual(cache.get_or_measure(BenchmarkRunner, {'n': 1}, self.measure(10)), 10)
+        self.assertEqual(cache.get_or_measure(BenchmarkRunner, {'n': 1}, self.measure(20)), 10)
+        self.assertEqual(self.calls, [10])
+
+        # Результат сохранен в файл и виден новому объекту кэша
+        reloaded = ResultCache(self.path)
+        self.assertEqual(reloaded.get_or_measure(BenchmarkRunner, {'n': 1}, self.measure(30)), 10)
+        self.assertEqual(self.calls, [10])
+
+    def test_params_change_invalidates(self):
+        cache = ResultCache(self.path)
+        cache.get_or_measure(BenchmarkRunner, {'n': 1}, self.measure(1))
+        self.assertEqual(cache.get_or_measure(BenchmarkRunner, {'n': 2}, self.measure(2)), 2)
+        self.assertNotEqual(cache.key(BenchmarkRunner, {'n': 1}), cache.key(BenchmarkRunner, {'n': 2}))
+        self.assertEqual(self.calls, [1, 2])
+
+    def test_source_change_invalidates(self):
+        cache = ResultCache(self.path)
+        func = self.load_function('measured', 'return 1')
+        cache.get_or_measure([func, BenchmarkRunner], {}, self.measure(1))
+
+        # Тот же файл с другим кодом функции
+        changed = self.load_function('measured', 'return 1 + 1')
+        self.assertEqual(cache.get_or_measure([changed, BenchmarkRunner], {}, self.measure(2)), 2)
+        # Код замера тоже входит в ключ
+        self.assertNotEqual(cache.key([changed, BenchmarkRunner], {}), cache.key([changed], {}))
+        self.assertEqual(self.calls, [1, 2])
+
+    def test_clear(self):
+        cache = ResultCache(self.path)
+        cache.get_or_measure(BenchmarkRunner, {}, self.measure(1))
+        self.assertTrue(os.path.exists(self.path))
+        cache.clear()
+        self.assertFalse(os.path.exists(self.path))
+        self.assertEqual(cache.get_or_measure(BenchmarkRunner, {}, self.measure(2)), 2)
+
+    def test_corrupted_file(self):
+        with open(self.path, 'w', encoding='utf-8') as file:
+            file.write('{not json')
+        cache = ResultCache(self.path)
+        self.assertEqual(cache.get_or_measure(BenchmarkRunner, {}, self.measure(3)), 3)
+
+
+class TestCompareRuns(unittest.TestCase):
+
+    def test_compare(self):
+        old = {'results': [{'case': 'x', 'median': 2.0}, {'case': 'y', 'median': 0.0},
+                           {'case': 'gone', 'median': 1.0}]}
+        new = {'results': [{'case': 'x', 'median': 1.0}, {'case': 'y', 'median': 1.0},
+                           {'case': 'added', 'median': 1.0}]}
+        self.assertEqual(compare_runs(old, new), [
+            ('x', 2.0, 1.0, 0.5),
+            ('y', 0.0, 1.0, float('inf')),
+        ])
+
+
+if __name__ == '__main__':
+    unittest.main()
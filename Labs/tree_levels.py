@@ -0,0 +1,32 @@
+"""
+Уровни бинарного дерева с правилами left = 2r + 1, right = 2r - 1
+в замкнутой форме (общие для лабораторных 3 и 5).
+
+Узел с индексом k на глубине d равен 2^d * (root + 1) - 1 - 2k, поэтому
+уровень строится одной операцией над массивом, без обхода дерева.
+"""
+
+try:
+    import numpy as np
+except ImportError:  # без NumPy уровни возвращаются как range
+    np = None
+
+
+def level_closed_form(depth, root):
+    """Значения уровня depth слева направо"""
+    top = (root + 1) * 2 ** depth - 1
+    width = 2 ** depth
+    bottom = top - 2 * (width - 1)
+    if np is not None and max(abs(top), abs(bottom)) < 2 ** 63:
+        return top - 2 * np.arange(width, dtype=np.int64)
+    return range(top, bottom - 1, -2)
+
+
+def gen_levels(height=6, root=9):
+    """
+    Генератор уровней дерева высоты height.
+    Уровень выдается как numpy.ndarray(int64), а если значения не
+    помещаются в int64 (или NumPy не установлен) - как range из int Python.
+    """
+    for depth in range(max(height, 0)):
+        yield level_closed_form(depth, root)
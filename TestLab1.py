@@ -2,6 +2,8 @@ from Lab1 import Solution
 
 from Lab1 import my_solution
 
+import Lab1 as lab1
+
 import unittest
 
 
@@ -112,6 +114,167 @@ class TestTwoSum(unittest.TestCase):
             self.assertNotIsInstance(target, float, f"Целевое значение {target} является float")
 
 
+class TestTwoSumHash(unittest.TestCase):
+
+    def test_same_pair_as_nested_loop(self):
+        """Хеш-версия возвращает ту же пару, что и вложенный цикл"""
+        cases = [
+            ([2, 7, 11, 15], 9),
+            ([2, 1, 3, 2], 4),
+            ([3, 3], 6),
+            ([-3, 4, 3, 90], 0),
+            ([1, 2, 3, 4], 10),
+            ([], 5),
+            ([5], 5),
+        ]
+        for nums, target in cases:
+            self.assertEqual(my_solution.two_sum_hash(nums, target),
+                             my_solution.two_sum(nums, target))
+
+    def test_random_arrays(self):
+        """Сравнение с вложенным циклом на случайных массивах"""
+        import random
+        rng = random.Random(0)
+        for _ in range(200):
+            nums = [rng.randint(-10, 10) for _ in range(rng.randint(0, 30))]
+            target = rng.randint(-20, 20)
+            self.assertEqual(my_solution.two_sum_hash(nums, target),
+                             my_solution.two_sum(nums, target))
+
+    def test_batch(self):
+        """Пакетный режим отвечает на каждую целевую сумму"""
+        nums = [2, 7, 11, 15]
+        result = my_solution.two_sum_batch(nums, [9, 26, 100])
+        self.assertEqual(result, [[0, 1], [2, 3], []])
+
+    def test_type_error(self):
+        """Нецелые элементы отклоняются"""
+        with self.assertRaises(TypeError):
+            my_solution.two_sum_hash([1, 2.5, 3], 4)
+
+
+class TestTwoSumNumpy(unittest.TestCase):
+
+    @unittest.skipIf(lab1.np is None, "NumPy не установлен")
+    def test_numpy_same_pair(self):
+        """NumPy-версия возвращает ту же пару, что и вложенный цикл"""
+        import random
+        rng = random.Random(1)
+        for _ in range(200):
+            nums = [rng.randint(-10, 10) for _ in range(rng.randint(0, 30))]
+            target = rng.randint(-20, 20)
+            self.assertEqual(my_solution.two_sum_numpy(nums, target, chunk_size=7),
+                             my_solution.two_sum(nums, target))
+
+    @unittest.skipIf(lab1.np is None, "NumPy не установлен")
+    def test_numpy_type_error(self):
+        """Нецелые элементы отклоняются и в NumPy-версии"""
+        with self.assertRaises(TypeError):
+            my_solution.two_sum_numpy([1, 2.5, 3], 4)
+
+    def test_auto_small_input(self):
+        """Автовыбор на малом массиве дает тот же результат"""
+        self.assertEqual(my_solution.two_sum_auto([3, 2, 4], 6), [1, 2])
+
+    def test_auto_large_input(self):
+        """Автовыбор на массиве больше порога"""
+        nums = list(range(lab1.NUMPY_THRESHOLD))
+        target = nums[-1] + nums[-2]
+        self.assertEqual(my_solution.two_sum_auto(nums, target),
+                         [len(nums) - 2, len(nums) - 1])
+
+
+class TestTwoSumStream(unittest.TestCase):
+
+    def test_stream_from_iterator(self):
+        """Пара находится без материализации входа"""
+        pair, stats = my_solution.two_sum_stream(iter([2, 7, 11, 15]), 9)
+        self.assertEqual(pair, [0, 1])
+        self.assertEqual(stats['read'], 2)
+
+    def test_stream_stops_early(self):
+        """Поток не дочитывается после первой пары"""
+        import itertools
+        pair, stats = my_solution.two_sum_stream(itertools.count(), 7)
+        self.assertEqual(pair, [3, 4])
+        self.assertEqual(stats['read'], 5)
+
+    def test_stream_no_solution(self):
+        """Решения нет - читается весь поток"""
+        pair, stats = my_solution.two_sum_stream(range(10), 100)
+        self.assertEqual(pair, [])
+        self.assertEqual(stats['read'], 10)
+        self.assertEqual(stats['peak_entries'], 10)
+
+    def test_stream_bounded_index(self):
+        """Размер индекса ограничен max_entries"""
+        pair, stats = my_solution.two_sum_stream(range(1000), -1, max_entries=16)
+        self.assertEqual(pair, [])
+        self.assertEqual(stats['peak_entries'], 16)
+
+    def test_stream_invalid_max_entries(self):
+        """max_entries меньше 1 недопустимо"""
+        with self.assertRaises(ValueError):
+            my_solution.two_sum_stream(iter([1, 2, 3]), 5, max_entries=0)
+
+    def test_stream_from_chunks(self):
+        """Поток из блоков и из файла"""
+        import io
+        chunks = [[3, 2], [4], [10]]
+        pair, _ = my_solution.two_sum_stream(lab1.iter_chunks(chunks), 6)
+        self.assertEqual(pair, [1, 2])
+
+        text = io.StringIO("12 345\n-6 78  9\n")
+        numbers = list(lab1.iter_file_numbers(text, chunk_size=2))
+        self.assertEqual(numbers, [12, 345, -6, 78, 9])
+
+
+class TestKSum(unittest.TestCase):
+
+    @staticmethod
+    def brute_force(nums, target, k):
+        import itertools
+        return sorted(combo for combo in itertools.combinations(range(len(nums)), k)
+                      if sum(nums[i] for i in combo) == target)
+
+    def test_all_pairs(self):
+        """Все пары, а не только первая"""
+        pairs = list(my_solution.iter_all_pairs([1, 3, 2, 2, 3], 5))
+        self.assertEqual(sorted(pairs), [(1, 2), (1, 3), (2, 4), (3, 4)])
+
+    def test_all_pairs_is_lazy(self):
+        """Генератор не материализует результат заранее"""
+        import types
+        pairs = my_solution.iter_all_pairs([0] * 10000, 0)
+        self.assertIsInstance(pairs, types.GeneratorType)
+        self.assertEqual(next(pairs), (0, 1))
+
+    def test_three_sum(self):
+        """Тройки с нулевой суммой"""
+        nums = [-1, 0, 1, 2, -1, -4]
+        self.assertEqual(sorted(my_solution.iter_three_sum(nums, 0)),
+                         self.brute_force(nums, 0, 3))
+
+    def test_k_sum_random(self):
+        """k-sum совпадает с полным перебором на случайных данных"""
+        import random
+        rng = random.Random(2)
+        for _ in range(100):
+            nums = [rng.randint(-5, 5) for _ in range(rng.randint(0, 12))]
+            k = rng.randint(1, 4)
+            target = rng.randint(-6, 6)
+            self.assertEqual(sorted(my_solution.iter_k_sum(nums, target, k)),
+                             self.brute_force(nums, target, k))
+            if k == 2:
+                self.assertEqual(sorted(my_solution.iter_all_pairs(nums, target)),
+                                 self.brute_force(nums, target, 2))
+
+    def test_k_sum_invalid_k(self):
+        """k меньше 1 недопустимо"""
+        with self.assertRaises(ValueError):
+            list(my_solution.iter_k_sum([1, 2], 3, 0))
+
+
 if __name__ == '__main__':
     unittest.main()
 